@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Article storage backends for MoneyMatrix.me
+DataManager reads and writes published articles and the publishing queue
+through one of these stores, chosen by storage.backend in config.json
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+from utils import logger
+
+class JSONArticleStore:
+    """Articles and queue kept in data/published_articles.json (the original layout).
+    
+    Every write rewrites the whole file, so this suits small sites only. Writes
+    are atomic and safe against concurrent writers (see DataManager.update_json).
+    """
+    
+    tracks_backlinks = False
+    filename = 'published_articles.json'
+    
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+    
+    def _load(self) -> Dict:
+        return self.data_manager.load_json(self.filename)
+    
+    def published_articles(self) -> List[Dict]:
+        """All published articles in publishing order"""
+        return self._load().get('published_articles', [])
+    
+    def add_published_article(self, article_data: Dict):
+        """Append an article that already carries published_at"""
+        def append(data: Dict):
+            if 'published_articles' not in data:
+                data['published_articles'] = []
+            
+            data['published_articles'].append(article_data)
+            data['total_published'] = len(data['published_articles'])
+            data['last_published'] = article_data['published_at']
+        
+        self.data_manager.update_json(self.filename, append)
+    
+    def get_article(self, slug: str) -> Optional[Dict]:
+        """Most recently published article with this slug (the one update_article changes)"""
+        for article in reversed(self.published_articles()):
+            if article.get('slug') == slug:
+                return article
+        return None
+    
+    def recent_articles(self, limit: int = 10, category_slug: Optional[str] = None,
+                        include_content: bool = True) -> List[Dict]:
+        """Newest articles, optionally within one category"""
+        articles = [
+            article for article in self.published_articles()
+            if category_slug is None or article.get('category_slug') == category_slug
+        ]
+        articles.sort(key=lambda x: x.get('date_published', ''), reverse=True)
+        return articles[:limit]
+    
+    def count_articles(self) -> int:
+        return len(self.published_articles())
+    
+    def last_published(self) -> Optional[str]:
+        return self._load().get('last_published')
+    
+    def publishing_queue(self) -> List[Dict]:
+        return self._load().get('publishing_schedule', {}).get('queue', [])
+    
+    def update_article(self, slug: str, changes: Dict) -> bool:
+        """Apply changes to the most recently published article with this slug"""
+        def update(data: Dict) -> bool:
+            for article in reversed(data.get('published_articles', [])):
+                if article.get('slug') == slug:
+                    article.update(changes)
+                    return True
+            return False
+        
+        return self.data_manager.update_json(self.filename, update)
+    
+    def add_to_queue(self, article_data: Dict):
+        def append(data: Dict):
+            if 'publishing_schedule' not in data:
+                data['publishing_schedule'] = {'queue': []}
+            
+            data['publishing_schedule']['queue'].append(article_data)
+        
+        self.data_manager.update_json(self.filename, append)
+    
+    def remove_from_queue(self, article_data: Dict) -> bool:
+        def remove(data: Dict) -> bool:
+            queue = data.get('publishing_schedule', {}).get('queue', [])
+            if article_data not in queue:
+                return False
+            queue.remove(article_data)
+            return True
+        
+        return self.data_manager.update_json(self.filename, remove)
+
+class SQLiteArticleStore:
+    """Articles in an SQLite database in WAL mode.
+    
+    Metadata rows are indexed by slug, category, date_published and status;
+    article bodies live in their own table so listings never read them.
+    Publishing is a single insert, whatever the size of the corpus.
+    """
+    
+    tracks_backlinks = False
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            slug TEXT NOT NULL,
+            category_slug TEXT,
+            date_published TEXT,
+            status TEXT NOT NULL DEFAULT 'published',
+            published_at TEXT,
+            metadata TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_articles_slug ON articles (slug);
+        CREATE INDEX IF NOT EXISTS idx_articles_category ON articles (category_slug, status, date_published);
+        CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (date_published);
+        CREATE INDEX IF NOT EXISTS idx_articles_status ON articles (status, date_published);
+        
+        CREATE TABLE IF NOT EXISTS article_bodies (
+            article_id INTEGER PRIMARY KEY REFERENCES articles (id) ON DELETE CASCADE,
+            content TEXT NOT NULL
+        );
+        
+        CREATE TABLE IF NOT EXISTS publishing_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TEXT NOT NULL
+        );
+        
+        CREATE TABLE IF NOT EXISTS store_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        # One connection per store, shared by the local server's threads
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        with self._lock, self.connection:
+            self.connection.executescript(self.SCHEMA)
+    
+    def close(self):
+        self.connection.close()
+    
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+    
+    @staticmethod
+    def _row_to_article(metadata: str, content: Optional[str] = None) -> Dict:
+        article = json.loads(metadata)
+        if content is not None:
+            article['content'] = content
+        return article
+    
+    def _select_articles(self, where: str = "", params: tuple = (), order: str = "a.id",
+                         limit: Optional[int] = None, include_content: bool = True) -> List[Dict]:
+        if include_content:
+            sql = ("SELECT a.metadata, b.content FROM articles a "
+                   "LEFT JOIN article_bodies b ON b.article_id = a.id")
+        else:
+            sql = "SELECT a.metadata, NULL FROM articles a"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + (limit,)
+        return [self._row_to_article(metadata, content) for metadata, content in self._query(sql, params)]
+    
+    def _insert_article(self, article_data: Dict):
+        """Insert one article; the caller holds the lock and the transaction"""
+        metadata = {key: value for key, value in article_data.items() if key != 'content'}
+        cursor = self.connection.execute(
+            "INSERT INTO articles (slug, category_slug, date_published, status, published_at, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                article_data.get('slug', ''),
+                article_data.get('category_slug'),
+                article_data.get('date_published'),
+                article_data.get('status', 'published'),
+                article_data.get('published_at'),
+                json.dumps(metadata)
+            )
+        )
+        if 'content' in article_data:
+            self.connection.execute(
+                "INSERT INTO article_bodies (article_id, content) VALUES (?, ?)",
+                (cursor.lastrowid, article_data['content'])
+            )
+        if article_data.get('published_at'):
+            self.connection.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('last_published', ?)",
+                (article_data['published_at'],)
+            )
+    
+    def published_articles(self) -> List[Dict]:
+        """All published articles in publishing order"""
+        return self._select_articles("a.status = 'published'")
+    
+    def add_published_article(self, article_data: Dict):
+        """Insert an article that already carries published_at"""
+        with self._lock, self.connection:
+            self._insert_article(article_data)
+    
+    def get_article(self, slug: str) -> Optional[Dict]:
+        """Most recently published article with this slug (the one update_article changes)"""
+        articles = self._select_articles("a.slug = ?", (slug,), order="a.id DESC", limit=1)
+        return articles[0] if articles else None
+    
+    def recent_articles(self, limit: int = 10, category_slug: Optional[str] = None,
+                        include_content: bool = True) -> List[Dict]:
+        """Newest articles, optionally within one category"""
+        if category_slug is None:
+            where, params = "a.status = 'published'", ()
+        else:
+            where, params = "a.category_slug = ? AND a.status = 'published'", (category_slug,)
+        return self._select_articles(
+            where, params, order="a.date_published DESC", limit=limit, include_content=include_content
+        )
+    
+    def count_articles(self) -> int:
+        return self._query("SELECT COUNT(*) FROM articles WHERE status = 'published'")[0][0]
+    
+    def last_published(self) -> Optional[str]:
+        rows = self._query("SELECT value FROM store_meta WHERE key = 'last_published'")
+        return rows[0][0] if rows else None
+    
+    def publishing_queue(self) -> List[Dict]:
+        return [json.loads(data) for data, in self._query("SELECT data FROM publishing_queue ORDER BY id")]
+    
+    def update_article(self, slug: str, changes: Dict) -> bool:
+        """Apply changes to the most recently published article with this slug"""
+        with self._lock, self.connection:
+            row = self.connection.execute(
+                "SELECT id, metadata FROM articles WHERE slug = ? ORDER BY id DESC LIMIT 1", (slug,)
+            ).fetchone()
+            if row is None:
+                return False
+            
+            article_id, metadata = row
+            metadata = json.loads(metadata)
+            metadata.update({key: value for key, value in changes.items() if key != 'content'})
+            self.connection.execute(
+                "UPDATE articles SET category_slug = ?, date_published = ?, status = ?, metadata = ? WHERE id = ?",
+                (
+                    metadata.get('category_slug'),
+                    metadata.get('date_published'),
+                    metadata.get('status', 'published'),
+                    json.dumps(metadata),
+                    article_id
+                )
+            )
+            if 'content' in changes:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO article_bodies (article_id, content) VALUES (?, ?)",
+                    (article_id, changes['content'])
+                )
+        return True
+    
+    def add_to_queue(self, article_data: Dict):
+        with self._lock, self.connection:
+            self.connection.execute("INSERT INTO publishing_queue (data) VALUES (?)", (json.dumps(article_data),))
+    
+    def remove_from_queue(self, article_data: Dict) -> bool:
+        with self._lock, self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM publishing_queue WHERE id = "
+                "(SELECT id FROM publishing_queue WHERE data = ? ORDER BY id LIMIT 1)",
+                (json.dumps(article_data),)
+            )
+        return cursor.rowcount > 0
+    
+    def is_migrated(self) -> bool:
+        return bool(self._query("SELECT 1 FROM store_meta WHERE key = 'migrated_from_json'"))
+    
+    def migrate_from_json(self, data: Dict, source: str = 'published_articles.json') -> int:
+        """Import a published_articles.json document in one transaction; return the
+        article count, or 0 if the database was already migrated"""
+        # Older files keep the list under 'articles'
+        articles = data.get('published_articles', data.get('articles', []))
+        queue = data.get('publishing_schedule', {}).get('queue', [])
+        
+        with self._lock, self.connection:
+            # Take the write lock before checking, so two processes opening a new
+            # database cannot both import
+            self.connection.execute("BEGIN IMMEDIATE")
+            if self.connection.execute("SELECT 1 FROM store_meta WHERE key = 'migrated_from_json'").fetchone():
+                logger.info(f"{self.db_path} was already migrated by another process")
+                return 0
+            
+            for article in articles:
+                self._insert_article(article)
+            for item in queue:
+                self.connection.execute("INSERT INTO publishing_queue (data) VALUES (?)", (json.dumps(item),))
+            if data.get('last_published'):
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('last_published', ?)",
+                    (data['last_published'],)
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('migrated_from_json', ?)",
+                (source,)
+            )
+        
+        logger.info(f"Migrated {len(articles)} articles and {len(queue)} queued items from {source} to {self.db_path}")
+        return len(articles)
+
+class EventLogArticleStore:
+    """Articles, queue and posted backlinks kept as an append-only event log.
+    
+    The state has the published_articles.json layout plus posted_backlinks and
+    lives in memory; each change appends one line to data/publish-log.jsonl.
+    The log is compacted into data/publish-log.snapshot.json in the background.
+    Reads first pick up events appended by other processes sharing the log.
+    """
+    
+    tracks_backlinks = True
+    
+    def __init__(self, data_dir: str, compact_every: int = 1000):
+        from event_log import EventLog
+        
+        self._by_slug = {}
+        self._indexed_state = None
+        self.log = EventLog(
+            data_dir, 'publish-log', self._apply, self._initial_state,
+            compact_every=compact_every, on_reload=self._reindex
+        )
+        self._reindex()
+    
+    @staticmethod
+    def _initial_state() -> Dict:
+        return {
+            'published_articles': [],
+            'total_published': 0,
+            'last_published': None,
+            'publishing_schedule': {'queue': []},
+            'posted_backlinks': {}
+        }
+    
+    def _reindex(self, state: Optional[Dict] = None):
+        """Index the articles of state (the live state by default) by slug"""
+        state = self.log.state if state is None else state
+        self._by_slug = {article.get('slug', ''): article for article in state['published_articles']}
+        self._indexed_state = state
+    
+    def _index(self, state: Dict) -> Dict[str, Dict]:
+        """Slug index for state, rebuilt when events are applied to a different state
+        object, e.g. one replayed from a snapshot another process wrote"""
+        if self._indexed_state is not state:
+            self._reindex(state)
+        return self._by_slug
+    
+    def _apply(self, state: Dict, event: Dict):
+        """Fold one event into the state; replay calls this too, so it may only
+        depend on state and event (the slug index is derived from state)"""
+        kind = event['type']
+        if kind == 'article_published':
+            article = event['article']
+            index = self._index(state)
+            state['published_articles'].append(article)
+            state['total_published'] = len(state['published_articles'])
+            state['last_published'] = article.get('published_at')
+            index[article.get('slug', '')] = article
+        elif kind == 'article_modified':
+            article = self._index(state).get(event['slug'])
+            if article is not None:
+                article.update(event['changes'])
+        elif kind == 'queue_added':
+            state['publishing_schedule']['queue'].append(event['item'])
+        elif kind == 'queue_removed':
+            queue = state['publishing_schedule']['queue']
+            if event['item'] in queue:
+                queue.remove(event['item'])
+        elif kind == 'backlink_posted':
+            state['posted_backlinks'].setdefault(event['slug'], {'posts': []})['posts'].append(event['post'])
+        else:
+            raise ValueError(f"Unknown event type: {kind}")
+    
+    def seed_from_json(self, data: Dict, posted_backlinks: Dict) -> bool:
+        """Start a new log from published_articles.json and posted_backlinks.json"""
+        state = self._initial_state()
+        state['published_articles'] = data.get('published_articles', data.get('articles', []))
+        state['total_published'] = len(state['published_articles'])
+        state['last_published'] = data.get('last_published')
+        state['publishing_schedule']['queue'] = data.get('publishing_schedule', {}).get('queue', [])
+        state['posted_backlinks'] = posted_backlinks
+        
+        if not self.log.seed(state):
+            return False
+        self._reindex()
+        logger.info(f"Seeded the publish log with {state['total_published']} articles")
+        return True
+    
+    def published_articles(self) -> List[Dict]:
+        """All published articles in publishing order"""
+        self.log.refresh()
+        return self.log.state['published_articles']
+    
+    def add_published_article(self, article_data: Dict):
+        """Append an article that already carries published_at"""
+        self.log.append('article_published', article=article_data)
+    
+    def get_article(self, slug: str) -> Optional[Dict]:
+        """Most recently published article with this slug"""
+        self.log.refresh()
+        return self._by_slug.get(slug)
+    
+    def recent_articles(self, limit: int = 10, category_slug: Optional[str] = None,
+                        include_content: bool = True) -> List[Dict]:
+        """Newest articles, optionally within one category"""
+        articles = [
+            article for article in self.published_articles()
+            if category_slug is None or article.get('category_slug') == category_slug
+        ]
+        articles.sort(key=lambda x: x.get('date_published', ''), reverse=True)
+        return articles[:limit]
+    
+    def count_articles(self) -> int:
+        self.log.refresh()
+        return self.log.state['total_published']
+    
+    def last_published(self) -> Optional[str]:
+        self.log.refresh()
+        return self.log.state['last_published']
+    
+    def update_article(self, slug: str, changes: Dict) -> bool:
+        """Apply changes to the most recently published article with this slug"""
+        if self.get_article(slug) is None:
+            return False
+        self.log.append('article_modified', slug=slug, changes=changes)
+        return True
+    
+    def publishing_queue(self) -> List[Dict]:
+        self.log.refresh()
+        return self.log.state['publishing_schedule']['queue']
+    
+    def add_to_queue(self, article_data: Dict):
+        self.log.append('queue_added', item=article_data)
+    
+    def remove_from_queue(self, article_data: Dict) -> bool:
+        if article_data not in self.publishing_queue():
+            return False
+        self.log.append('queue_removed', item=article_data)
+        return True
+    
+    def posted_backlinks(self) -> Dict:
+        """{article slug: {'posts': [...]}} for every backlink posted"""
+        self.log.refresh()
+        return self.log.state['posted_backlinks']
+    
+    def record_backlink(self, slug: str, post_record: Dict):
+        self.log.append('backlink_posted', slug=slug, post=post_record)
+
+# Log and SQLite stores opened by this process, keyed by (backend, absolute path)
+_shared_stores = {}
+_shared_stores_lock = threading.Lock()
+
+def create_article_store(data_manager, backend: str = 'json', db_path: Optional[str] = None):
+    """Open the configured store, migrating the JSON data into a new SQLite store
+    or event log once.
+    
+    Log and SQLite stores are shared by every DataManager in the process, so the
+    log is replayed once and all callers see the same state.
+    """
+    if backend == 'json':
+        return JSONArticleStore(data_manager)
+    
+    if backend == 'log':
+        path = data_manager.data_dir
+    elif backend == 'sqlite':
+        path = db_path or os.path.join(data_manager.data_dir, 'articles.db')
+    else:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    
+    key = (backend, os.path.abspath(path))
+    with _shared_stores_lock:
+        store = _shared_stores.get(key)
+        if store is None:
+            store = _open_store(data_manager, backend, path)
+            _shared_stores[key] = store
+    return store
+
+def _open_store(data_manager, backend: str, path: str):
+    if backend == 'log':
+        store = EventLogArticleStore(path)
+        if store.log.is_empty():
+            store.seed_from_json(
+                data_manager.load_json(JSONArticleStore.filename, mutable=True),
+                data_manager.load_json('posted_backlinks.json', mutable=True)
+            )
+        return store
+    
+    store = SQLiteArticleStore(path)
+    if not store.is_migrated():
+        store.migrate_from_json(data_manager.load_json(JSONArticleStore.filename))
+    return store
+
+def main():
+    """Command line entry point"""
+    import argparse
+    from utils import DataManager, config_manager
+    
+    parser = argparse.ArgumentParser(description='MoneyMatrix.me article store')
+    parser.add_argument('command', choices=['migrate'], help='migrate: copy published_articles.json into SQLite')
+    parser.add_argument('--db', default=config_manager.get('storage.sqlite_path', 'data/articles.db'),
+                        help='SQLite database path')
+    args = parser.parse_args()
+    
+    data_manager = DataManager(backend='json')
+    store = SQLiteArticleStore(args.db)
+    if store.is_migrated():
+        logger.info(f"{args.db} already holds migrated articles; nothing to do")
+        return
+    store.migrate_from_json(data_manager.load_json(JSONArticleStore.filename))
+    logger.info("Set storage.backend to \"sqlite\" in config.json to use it")
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ This is the main orchestration script that handles:
 Usage:
     python scripts/auto_post.py                    # Full automation cycle
     python scripts/auto_post.py --build-only       # Build site without new content
+    python scripts/auto_post.py --build-only --full-rebuild  # Re-render every page
+    python scripts/auto_post.py --build-only --profile       # Write build_profile.json
     python scripts/auto_post.py --generate-only    # Generate content only
     python scripts/auto_post.py --deploy           # Deploy to Cloudflare
     python scripts/auto_post.py --backlinks        # Create backlinks only
@@ -108,17 +110,20 @@ class MoneyMatrixOrchestrator:
         
         return processed_articles
     
-    def build_static_site(self):
+    def build_static_site(self, full_rebuild: bool = False):
         """Build the complete static site"""
         logger.info("Building static site")
         
+        profiler = self.html_generator.profiler
         try:
-            # Ensure templates exist
-            template_manager = TemplateManager()
-            template_manager.create_all_templates()
-            
-            # Build the site
-            self.html_generator.build_complete_site()
+            with profiler.build("build_static_site"):
+                # Ensure templates exist
+                with profiler.stage("templates"):
+                    template_manager = TemplateManager()
+                    template_manager.create_all_templates()
+                
+                # Build the site
+                self.html_generator.build_complete_site(full_rebuild=full_rebuild)
             
             logger.info("Static site build completed")
             
@@ -212,13 +217,13 @@ class MoneyMatrixOrchestrator:
             logger.error(f"Automation cycle failed: {e}")
             raise
     
-    def build_only_mode(self):
+    def build_only_mode(self, full_rebuild: bool = False):
         """Build site without generating new content"""
         logger.info("=== Build Only Mode ===")
         
         try:
             # Build static site with existing content
-            self.build_static_site()
+            self.build_static_site(full_rebuild=full_rebuild)
             
             logger.info("Build completed successfully")
             
@@ -316,6 +321,9 @@ def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='MoneyMatrix.me Content Automation')
     parser.add_argument('--build-only', action='store_true', help='Build site without generating new content')
+    parser.add_argument('--full-rebuild', action='store_true', help='Re-render every page instead of only changed ones')
+    parser.add_argument('--profile', action='store_true', help='Write a per-stage build timing report (build_profile.json)')
+    parser.add_argument('--cprofile', action='store_true', help='With --profile, also dump cProfile stats of the build')
     parser.add_argument('--generate-only', action='store_true', help='Generate content only')
     parser.add_argument('--generate-count', type=int, default=1, help='Number of articles to generate')
     parser.add_argument('--backlinks', action='store_true', help='Create backlinks only')
@@ -330,6 +338,10 @@ def main():
     try:
         orchestrator = MoneyMatrixOrchestrator()
         
+        if args.profile or args.cprofile:
+            orchestrator.html_generator.profiler.enabled = True
+            orchestrator.html_generator.profiler.capture_cprofile = args.cprofile
+        
         if args.status:
             status = orchestrator.get_system_status()
             print("\n=== MoneyMatrix.me System Status ===")
@@ -346,7 +358,7 @@ def main():
             return
         
         if args.build_only:
-            orchestrator.build_only_mode()
+            orchestrator.build_only_mode(full_rebuild=args.full_rebuild)
             
         elif args.generate_only:
             orchestrator.generate_only_mode(args.generate_count)
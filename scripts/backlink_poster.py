@@ -1,5 +1,5 @@
 import requests
-import json
+import copy
 import time
 import random
 from datetime import datetime
@@ -171,16 +171,22 @@ class BacklinkPoster:
     
     def load_posted_backlinks(self) -> Dict:
         """Load posted backlinks tracking"""
-        try:
-            with open('data/posted_backlinks.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        store = self.data_manager.article_store
+        if store.tracks_backlinks:
+            return copy.deepcopy(store.posted_backlinks())
+        
+        return self.data_manager.load_json('posted_backlinks.json', mutable=True)
     
-    def save_posted_backlinks(self):
-        """Save posted backlinks tracking"""
-        with open('data/posted_backlinks.json', 'w') as f:
-            json.dump(self.posted_backlinks, f, indent=2)
+    def save_posted_backlinks(self, article_slug: Optional[str] = None, post_record: Optional[Dict] = None):
+        """Save posted backlinks tracking, keeping posts other processes recorded meanwhile"""
+        def merge(data: Dict):
+            if post_record is None:
+                data.update(self.posted_backlinks)
+            else:
+                data.setdefault(article_slug, {'posts': []})['posts'].append(post_record)
+            return data
+        
+        self.posted_backlinks = self.data_manager.update_json('posted_backlinks.json', merge)
     
     def get_articles_needing_backlinks(self) -> List[Dict]:
         """Get articles that need backlink posts"""
@@ -417,7 +423,10 @@ Compare financial products and make smart money decisions.</em></p>
                 }
                 
                 self.posted_backlinks[article_slug]['posts'].append(post_record)
-                self.save_posted_backlinks()
+                if self.data_manager.article_store.tracks_backlinks:
+                    self.data_manager.article_store.record_backlink(article_slug, post_record)
+                else:
+                    self.save_posted_backlinks(article_slug, post_record)
                 
                 logger.info(f"Successfully posted backlink to {platform} for: {article_data['title']}")
                 return True
@@ -519,8 +528,7 @@ def simulate_backlink_posting():
         }
     
     # Save simulated data
-    with open('data/posted_backlinks.json', 'w') as f:
-        json.dump(simulated_backlinks, f, indent=2)
+    data_manager.save_json('posted_backlinks.json', simulated_backlinks)
     
     logger.info(f"Simulated {len(simulated_backlinks)} backlink posts")
 
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the MoneyMatrix.me JSON codec
+
+Encodes and decodes real data files with each available codec and reports
+the output size and the best per-operation time as JSON. The baseline is the
+indented stdlib format the data files used to be written in; json_codec's
+default (compact, orjson when installed) is what DataManager writes now.
+
+Usage:
+    python scripts/benchmark_json.py
+    python scripts/benchmark_json.py --files data/published_articles.json --number 50
+    python scripts/benchmark_json.py --output json-bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import json_codec
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_FILES = ['data/payday-loans-content-plan.json', 'data/published_articles.json']
+
+BASELINE = 'json-indent2'
+
+def available_codecs() -> Dict[str, Dict[str, Callable]]:
+    """{name: {'dumps': ..., 'loads': ...}} for every codec importable here"""
+    codecs = {
+        BASELINE: {
+            'dumps': lambda data: json.dumps(data, indent=2).encode('utf-8'),
+            'loads': lambda raw: json.loads(raw.decode('utf-8'))
+        },
+        'json-compact': {
+            'dumps': lambda data: json.dumps(data, separators=(',', ':')).encode('utf-8'),
+            'loads': json.loads
+        }
+    }
+
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        codecs['orjson-indent2'] = {
+            'dumps': lambda data: orjson.dumps(data, option=orjson.OPT_INDENT_2),
+            'loads': orjson.loads
+        }
+        codecs['orjson-compact'] = {'dumps': orjson.dumps, 'loads': orjson.loads}
+
+    codecs[f'json_codec ({json_codec.BACKEND})'] = {'dumps': json_codec.dumps, 'loads': json_codec.loads}
+    return codecs
+
+def best_time(operation: Callable[[], object], number: int, repeat: int) -> float:
+    """Fastest mean seconds per call over repeat rounds of number calls"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = (time.perf_counter() - started) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def benchmark_file(path: str, codecs: Dict[str, Dict[str, Callable]], number: int, repeat: int) -> Dict:
+    """Time every codec on one data file"""
+    with open(path, 'rb') as f:
+        data = json.loads(f.read())
+
+    results = {}
+    for name, codec in codecs.items():
+        encoded = codec['dumps'](data)
+        if codec['loads'](encoded) != data:
+            raise RuntimeError(f"{name} did not round-trip {path}")
+
+        results[name] = {
+            'bytes': len(encoded),
+            'encode_ms': round(best_time(lambda: codec['dumps'](data), number, repeat) * 1000, 3),
+            'decode_ms': round(best_time(lambda: codec['loads'](encoded), number, repeat) * 1000, 3)
+        }
+
+    baseline = results[BASELINE]
+    for result in results.values():
+        result['size_ratio'] = round(result['bytes'] / baseline['bytes'], 3)
+        result['encode_speedup'] = round(baseline['encode_ms'] / result['encode_ms'], 2) if result['encode_ms'] else None
+        result['decode_speedup'] = round(baseline['decode_ms'] / result['decode_ms'], 2) if result['decode_ms'] else None
+
+    return {'file': os.path.relpath(path, PROJECT_DIR), 'codecs': results}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding and decoding of MoneyMatrix.me data files')
+    parser.add_argument('--files', nargs='+', default=DEFAULT_FILES, help='Data files to benchmark, relative to the project')
+    parser.add_argument('--number', type=int, default=20, help='Calls per timing round')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing rounds; the fastest is reported')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    args = parser.parse_args()
+
+    paths = [path if os.path.isabs(path) else os.path.join(PROJECT_DIR, path) for path in args.files]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        parser.error(f"missing file(s): {', '.join(missing)}")
+
+    codecs = available_codecs()
+    report = {
+        'config': {
+            'number': args.number,
+            'repeat': args.repeat,
+            'baseline': BASELINE,
+            'json_codec_backend': json_codec.BACKEND,
+            'python': sys.version.split()[0]
+        },
+        'results': []
+    }
+
+    for path in paths:
+        print(f"Benchmarking {os.path.relpath(path, PROJECT_DIR)}...", file=sys.stderr)
+        report['results'].append(benchmark_file(path, codecs, args.number, args.repeat))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"Wrote benchmark report to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Load-testing benchmark for the MoneyMatrix.me static origin servers
+
+Builds a synthetic dist/ of N articles in a throwaway project directory,
+starts one of the servers against it and drives a concurrent client mix
+(clean-URL articles, .html URLs, category pages, CSS/JS, images, 404s and
+conditional GETs). Throughput and p50/p95/p99 latency are reported as JSON.
+
+Usage:
+    python scripts/benchmark_servers.py                                # railway server, defaults
+    python scripts/benchmark_servers.py --servers railway,railway-single,simple
+    python scripts/benchmark_servers.py --articles 2000 --concurrency 32 --duration 20
+    python scripts/benchmark_servers.py --accept-encoding gzip --output bench.json
+"""
+
+import os
+import re
+import sys
+import json
+import gzip
+import time
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+from email.utils import formatdate
+from typing import Dict, List, Optional
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# How each server is launched inside the scratch project directory.
+# "files" are copied relative to the project root; "port" is "env", "arg" or "stdout".
+SERVER_SPECS = {
+    'railway': {
+        'files': ['railway_server.py'],
+        'command': ['railway_server.py'],
+        'port': 'env',
+        'env': {'SERVER_MODE': 'threaded', 'ACCESS_LOG': 'off'}
+    },
+    'railway-single': {
+        'files': ['railway_server.py'],
+        'command': ['railway_server.py'],
+        'port': 'env',
+        'env': {'SERVER_MODE': 'single', 'ACCESS_LOG': 'off'}
+    },
+    'simple': {
+        'files': ['scripts/simple_server.py'],
+        'command': ['scripts/simple_server.py', '--no-browser'],
+        'port': 'arg',
+        'env': {}
+    },
+    'local': {
+        'files': ['scripts', 'config.json', 'advanced_prompts', 'data/categories.json', 'data/topics.json'],
+        'command': ['scripts/local_server.py', '--no-browser'],
+        'port': 'arg',
+        'env': {}
+    },
+    'start': {
+        'files': ['start_server.py'],
+        'command': ['start_server.py'],
+        'port': 'stdout',
+        'env': {'BROWSER': 'true'}
+    }
+}
+
+# Relative weights of each request kind in the client mix
+DEFAULT_MIX = {
+    'article_clean': 45,
+    'article_html': 10,
+    'category': 10,
+    'homepage': 5,
+    'asset': 15,
+    'image': 5,
+    'not_found': 5,
+    'conditional': 5
+}
+
+CATEGORIES = ['personal-loans', 'credit-cards', 'mortgages', 'payday-loans', 'auto-loans', 'savings-accounts']
+
+class SyntheticSite:
+    """Writes a dist/ tree shaped like a real build"""
+
+    def __init__(self, project_dir: str, articles: int, images: int, precompress: bool, seed: int = 42):
+        self.dist_dir = os.path.join(project_dir, 'dist')
+        self.articles = articles
+        self.images = images
+        self.precompress = precompress
+        self.random = random.Random(seed)
+        self.article_urls = []
+        self.category_urls = []
+        self.asset_urls = []
+        self.image_urls = []
+
+    def build(self):
+        """Generate the site and record the URLs the client mix draws from"""
+        os.makedirs(os.path.join(self.dist_dir, 'static', 'css'), exist_ok=True)
+        os.makedirs(os.path.join(self.dist_dir, 'static', 'js'), exist_ok=True)
+        os.makedirs(os.path.join(self.dist_dir, 'static', 'images'), exist_ok=True)
+
+        paragraph = ('<p>Compare rates, fees and repayment terms before you borrow. '
+                     'Lenders price risk differently, so the same loan can cost very different amounts.</p>\n')
+
+        for i in range(self.articles):
+            category = CATEGORIES[i % len(CATEGORIES)]
+            slug = f"synthetic-article-{i}"
+            body = paragraph * self.random.randint(40, 120)
+            self._write(f"{category}/{slug}.html", self._page(f"Article {i}", body))
+            self.article_urls.append(f"/{category}/{slug}")
+
+        for category in CATEGORIES:
+            links = ''.join(f'<li><a href="{url}">{url}</a></li>\n'
+                            for url in self.article_urls if url.startswith(f"/{category}/"))
+            self._write(f"{category}.html", self._page(category, f"<ul>{links}</ul>"))
+            self.category_urls.append(f"/{category}")
+
+        self._write('index.html', self._page('MoneyMatrix.me', paragraph * 50))
+        self._write('static/css/main.css', ':root { --primary-color: #0066cc; }\n' * 2000)
+        self._write('static/js/main.js', 'document.addEventListener("DOMContentLoaded", function () {});\n' * 1500)
+        self.asset_urls = ['/static/css/main.css', '/static/js/main.js']
+
+        for i in range(self.images):
+            size = self.random.randint(50, 300) * 1024
+            self._write(f"static/images/image-{i}.jpg", self.random.randbytes(size))
+            self.image_urls.append(f"/static/images/image-{i}.jpg")
+
+        if self.precompress:
+            self._precompress()
+
+    def _page(self, title: str, body: str) -> str:
+        return (f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="UTF-8"><title>{title}</title>'
+                f'<link rel="stylesheet" href="/static/css/main.css"></head>\n<body>{body}</body></html>\n')
+
+    def _write(self, rel_path: str, content):
+        path = os.path.join(self.dist_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        mode = 'wb' if isinstance(content, bytes) else 'w'
+        with open(path, mode) as f:
+            f.write(content)
+
+    def _precompress(self):
+        """Write .gz siblings the way the site build does"""
+        for root, _, files in os.walk(self.dist_dir):
+            for filename in files:
+                if filename.endswith(('.html', '.css', '.js')):
+                    path = os.path.join(root, filename)
+                    with open(path, 'rb') as f:
+                        compressed = gzip.compress(f.read(), compresslevel=9, mtime=0)
+                    with open(path + '.gz', 'wb') as f:
+                        f.write(compressed)
+
+class ServerProcess:
+    """Runs one server from a scratch project directory"""
+
+    def __init__(self, name: str, project_dir: str, startup_timeout: float = 20.0):
+        self.name = name
+        self.spec = SERVER_SPECS[name]
+        self.project_dir = project_dir
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.port = None
+
+    def start(self):
+        for rel_path in self.spec['files']:
+            source = os.path.join(PROJECT_DIR, rel_path)
+            target = os.path.join(self.project_dir, rel_path)
+            if not os.path.exists(source) or os.path.exists(target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.isdir(source):
+                shutil.copytree(source, target, ignore=shutil.ignore_patterns('__pycache__'))
+            else:
+                shutil.copy2(source, target)
+
+        env = dict(os.environ, PYTHONUNBUFFERED='1', **self.spec['env'])
+        command = [sys.executable] + self.spec['command']
+
+        if self.spec['port'] == 'env':
+            self.port = find_free_port()
+            env['PORT'] = str(self.port)
+        elif self.spec['port'] == 'arg':
+            self.port = find_free_port()
+            command += ['--port', str(self.port)]
+
+        self.process = subprocess.Popen(
+            command, cwd=self.project_dir, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+
+        self.output = []
+        threading.Thread(target=self._drain_output, daemon=True).start()
+        self._wait_until_ready()
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def _drain_output(self):
+        # Keep reading so a chatty server never blocks on a full pipe
+        for line in self.process.stdout:
+            if len(self.output) < 200:
+                self.output.append(line)
+            if self.port is None:
+                match = re.search(r'localhost:(\d+)', line)
+                if match:
+                    self.port = int(match.group(1))
+
+    def _wait_until_ready(self):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            if self.port:
+                try:
+                    socket.create_connection(('127.0.0.1', self.port), timeout=0.5).close()
+                    return
+                except OSError:
+                    pass
+            time.sleep(0.1)
+
+        self.stop()
+        raise RuntimeError(f"{self.name} server did not start:\n{''.join(self.output[-20:])}")
+
+class LoadGenerator:
+    """Concurrent HTTP client driving a weighted request mix"""
+
+    def __init__(self, port: int, site: SyntheticSite, concurrency: int, duration: float,
+                 max_requests: Optional[int], mix: Dict[str, int], accept_encoding: Optional[str], seed: int = 7):
+        self.port = port
+        self.site = site
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_requests = max_requests
+        self.kinds = list(mix.keys())
+        self.weights = list(mix.values())
+        self.accept_encoding = accept_encoding
+        self.seed = seed
+        self.validators = {}
+        self.samples = []
+        self.errors = 0
+        self.issued = 0
+        self._lock = threading.Lock()
+
+    def run(self) -> Dict:
+        deadline = time.perf_counter() + self.duration
+        threads = [
+            threading.Thread(target=self._worker, args=(deadline, random.Random(self.seed + i)))
+            for i in range(self.concurrency)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return self._report(elapsed)
+
+    def _next_request_allowed(self) -> bool:
+        with self._lock:
+            if self.max_requests is not None and self.issued >= self.max_requests:
+                return False
+            self.issued += 1
+            return True
+
+    def _worker(self, deadline: float, rng: random.Random):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        samples = []
+        errors = 0
+
+        while time.perf_counter() < deadline and self._next_request_allowed():
+            kind = rng.choices(self.kinds, self.weights)[0]
+            path, headers = self._build_request(kind, rng)
+
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+                latency = time.perf_counter() - started
+
+                if kind != 'conditional' and response.status == 200:
+                    self._remember_validators(path, response)
+                samples.append((kind, response.status, latency, len(body)))
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+
+        connection.close()
+        with self._lock:
+            self.samples.extend(samples)
+            self.errors += errors
+
+    def _build_request(self, kind: str, rng: random.Random):
+        headers = {}
+        if self.accept_encoding:
+            headers['Accept-Encoding'] = self.accept_encoding
+
+        if kind == 'article_clean':
+            path = rng.choice(self.site.article_urls)
+        elif kind == 'article_html':
+            path = rng.choice(self.site.article_urls) + '.html'
+        elif kind == 'category':
+            path = rng.choice(self.site.category_urls)
+        elif kind == 'homepage':
+            path = '/'
+        elif kind == 'asset':
+            path = rng.choice(self.site.asset_urls)
+        elif kind == 'image' and self.site.image_urls:
+            path = rng.choice(self.site.image_urls)
+        elif kind == 'conditional':
+            path = rng.choice(self.site.article_urls[:50] + self.site.asset_urls)
+            validators = self.validators.get(path, {})
+            if 'etag' in validators:
+                headers['If-None-Match'] = validators['etag']
+            headers['If-Modified-Since'] = validators.get('last_modified', formatdate(time.time(), usegmt=True))
+        else:
+            path = f"/missing/page-{rng.randint(0, 10 ** 6)}"
+
+        return path, headers
+
+    def _remember_validators(self, path: str, response: http.client.HTTPResponse):
+        etag = response.getheader('ETag')
+        last_modified = response.getheader('Last-Modified')
+        validators = {}
+        if etag:
+            validators['etag'] = etag
+        if last_modified:
+            validators['last_modified'] = last_modified
+        if validators:
+            self.validators[path] = validators
+
+    def _report(self, elapsed: float) -> Dict:
+        latencies = sorted(sample[2] for sample in self.samples)
+        by_kind = {}
+        status_counts = {}
+
+        for kind, status, latency, size in self.samples:
+            status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+            by_kind.setdefault(kind, []).append(latency)
+
+        return {
+            'requests': len(self.samples),
+            'errors': self.errors,
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_rps': round(len(self.samples) / elapsed, 1) if elapsed else 0,
+            'bytes_received': sum(sample[3] for sample in self.samples),
+            'latency_ms': summarize_latencies(latencies),
+            'status_counts': status_counts,
+            'by_kind': {
+                kind: dict(count=len(values), **summarize_latencies(sorted(values)))
+                for kind, values in sorted(by_kind.items())
+            }
+        }
+
+def summarize_latencies(latencies: List[float]) -> Dict:
+    """p50/p95/p99/max/mean in milliseconds from a sorted list of seconds"""
+    if not latencies:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None, 'mean': None}
+
+    def percentile(p: float) -> float:
+        index = min(len(latencies) - 1, max(0, int(round(p / 100 * len(latencies) + 0.5)) - 1))
+        return round(latencies[index] * 1000, 3)
+
+    return {
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'p99': percentile(99),
+        'max': round(latencies[-1] * 1000, 3),
+        'mean': round(sum(latencies) / len(latencies) * 1000, 3)
+    }
+
+def find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def parse_mix(value: Optional[str]) -> Dict[str, int]:
+    """Parse 'article_clean=50,asset=20,...' overrides on top of DEFAULT_MIX"""
+    mix = dict(DEFAULT_MIX)
+    if not value:
+        return mix
+
+    for part in value.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in DEFAULT_MIX:
+            raise ValueError(f"Unknown request kind '{kind}' (choose from {', '.join(DEFAULT_MIX)})")
+        mix[kind] = int(weight)
+
+    return {kind: weight for kind, weight in mix.items() if weight > 0}
+
+def benchmark_server(name: str, args) -> Dict:
+    """Build a fresh site, start one server against it and run the load"""
+    project_dir = tempfile.mkdtemp(prefix=f'mm-bench-{name}-')
+    server = ServerProcess(name, project_dir)
+
+    try:
+        site = SyntheticSite(project_dir, args.articles, args.images, args.precompress)
+        site.build()
+        server.start()
+
+        # Warm-up pass so caches and imports are not measured
+        LoadGenerator(server.port, site, args.concurrency, args.warmup, None,
+                      parse_mix(args.mix), args.accept_encoding).run()
+
+        result = LoadGenerator(server.port, site, args.concurrency, args.duration, args.requests,
+                               parse_mix(args.mix), args.accept_encoding).run()
+        result['server'] = name
+        return result
+    finally:
+        server.stop()
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the MoneyMatrix.me static origin servers')
+    parser.add_argument('--servers', default='railway', help=f"Comma-separated servers: {', '.join(SERVER_SPECS)}")
+    parser.add_argument('--articles', type=int, default=500, help='Synthetic articles to generate')
+    parser.add_argument('--images', type=int, default=20, help='Synthetic images to generate')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client connections')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of measured load per server')
+    parser.add_argument('--requests', type=int, help='Stop after this many requests instead of the full duration')
+    parser.add_argument('--warmup', type=float, default=2.0, help='Seconds of unmeasured warm-up load')
+    parser.add_argument('--mix', help='Override request weights, e.g. "article_clean=60,not_found=0"')
+    parser.add_argument('--accept-encoding', help='Accept-Encoding header to send, e.g. "gzip, br"')
+    parser.add_argument('--precompress', action='store_true', help='Write .gz siblings like the site build')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    args = parser.parse_args()
+
+    servers = [name.strip() for name in args.servers.split(',') if name.strip()]
+    unknown = [name for name in servers if name not in SERVER_SPECS]
+    if unknown:
+        parser.error(f"unknown server(s): {', '.join(unknown)}")
+
+    report = {
+        'config': {
+            'articles': args.articles,
+            'images': args.images,
+            'concurrency': args.concurrency,
+            'duration_seconds': args.duration,
+            'max_requests': args.requests,
+            'mix': parse_mix(args.mix),
+            'accept_encoding': args.accept_encoding,
+            'precompress': args.precompress,
+            'python': sys.version.split()[0]
+        },
+        'results': []
+    }
+
+    for name in servers:
+        print(f"Benchmarking {name}...", file=sys.stderr)
+        try:
+            report['results'].append(benchmark_server(name, args))
+        except RuntimeError as e:
+            report['results'].append({'server': name, 'error': str(e)})
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"Wrote benchmark report to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
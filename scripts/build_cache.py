@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Build cache for MoneyMatrix.me incremental site builds
+Records a hash of the inputs each output page was rendered from
+"""
+
+import os
+import json
+import hashlib
+from typing import Callable, Dict, List, Optional
+from utils import logger
+
+class BuildCache:
+    """Per-page input hashes stored next to the build output.
+    
+    Asset URLs are not page inputs: for each page the cache also records the
+    /static/ URLs it references and the (fingerprinted) URLs written in their
+    place, so pages can be re-pointed at changed assets without re-rendering.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, output_dir: str, cache_name: str = ".build-cache.json"):
+        self.output_dir = output_dir
+        self.cache_path = os.path.join(output_dir, cache_name)
+        self.previous, self.previous_assets = self._load()
+        self.pages = {}
+        self.assets = {}
+    
+    def _load(self) -> tuple:
+        """Load the page hashes and asset references recorded by the previous build"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        
+        if data.get('version') != self.VERSION:
+            return {}, {}
+        return data.get('pages', {}), data.get('assets', {})
+    
+    @staticmethod
+    def hash_inputs(*inputs) -> str:
+        """Stable hash of JSON-serializable page inputs"""
+        payload = json.dumps(inputs, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def is_current(self, rel_path: str, input_hash: str) -> bool:
+        """Check whether rel_path was rendered from these inputs and still exists"""
+        return (
+            self.previous.get(rel_path) == input_hash
+            and os.path.exists(os.path.join(self.output_dir, rel_path))
+        )
+    
+    def record(self, rel_path: str, input_hash: str):
+        """Record the inputs rel_path is now rendered from"""
+        self.pages[rel_path] = input_hash
+    
+    def record_assets(self, rel_path: str, assets: Dict[str, str]):
+        """Record {asset URL: URL written into the page} for rel_path"""
+        if assets:
+            self.assets[rel_path] = assets
+    
+    def stale_pages(self) -> List[str]:
+        """Pages from the previous build that this build no longer produces"""
+        return [rel_path for rel_path in self.previous if rel_path not in self.pages]
+    
+    def remove_stale_pages(self) -> int:
+        """Delete outputs (and compressed variants) no longer produced"""
+        removed = 0
+        for rel_path in self.stale_pages():
+            file_path = os.path.join(self.output_dir, rel_path)
+            for path in (file_path, file_path + '.gz', file_path + '.br'):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed += 1
+            logger.info(f"Removed stale page: {rel_path}")
+        return removed
+    
+    def save(self):
+        """Write the hashes recorded during this build"""
+        # Replace rather than truncate: the cache may be hardlinked into an
+        # earlier build generation
+        temp_path = f"{self.cache_path}.tmp-{os.getpid()}"
+        with open(temp_path, 'w') as f:
+            json.dump({'version': self.VERSION, 'pages': self.pages, 'assets': self.assets}, f)
+        os.replace(temp_path, self.cache_path)
+
+def seed_from_directory(source_dir: str, dest_dir: str) -> int:
+    """Hardlink every file from source_dir into dest_dir, copying where links fail.
+    
+    Files that are re-rendered afterwards must be unlinked before writing, never
+    truncated, so the source directory is left untouched.
+    """
+    import shutil
+    
+    linked = 0
+    for root, dirs, filenames in os.walk(source_dir):
+        target_root = os.path.join(dest_dir, os.path.relpath(root, source_dir))
+        os.makedirs(target_root, exist_ok=True)
+        
+        for filename in filenames:
+            source_path = os.path.join(root, filename)
+            target_path = os.path.join(target_root, filename)
+            try:
+                os.link(source_path, target_path)
+            except OSError:
+                shutil.copy2(source_path, target_path)
+            linked += 1
+    
+    return linked
+
+def _file_hash(file_path: str) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def sync_directory(source_dir: str, dest_dir: str, compare: str = "mtime",
+                   hardlink: bool = True, keep: Optional[Callable[[str], bool]] = None) -> Dict[str, int]:
+    """Make dest_dir mirror source_dir, touching only files that differ.
+    
+    Files are compared by size and mtime, or by content hash with compare="hash".
+    Changed files are unlinked and replaced (hardlinked where allowed), files
+    no longer in source_dir are removed, and .gz/.br variants written next to a
+    synced file by the build are kept while their source exists. Files for which
+    keep(relative path) is true are never removed.
+    """
+    import shutil
+    
+    stats = {'linked': 0, 'copied': 0, 'unchanged': 0, 'removed': 0, 'bytes': 0}
+    wanted = set()
+    
+    for root, dirs, filenames in os.walk(source_dir):
+        rel_root = os.path.relpath(root, source_dir)
+        target_root = os.path.normpath(os.path.join(dest_dir, rel_root))
+        os.makedirs(target_root, exist_ok=True)
+        
+        for filename in filenames:
+            source_path = os.path.join(root, filename)
+            target_path = os.path.join(target_root, filename)
+            wanted.add(os.path.normpath(os.path.join(rel_root, filename)))
+            
+            source_stat = os.stat(source_path)
+            try:
+                target_stat = os.stat(target_path)
+            except OSError:
+                target_stat = None
+            
+            # With hardlinks off, a target an earlier sync linked to its source is
+            # replaced by a copy, so writes to the source stop reaching the output
+            shared = (
+                target_stat is not None and not hardlink
+                and (target_stat.st_dev, target_stat.st_ino) == (source_stat.st_dev, source_stat.st_ino)
+            )
+            if target_stat is not None and target_stat.st_size == source_stat.st_size and not shared:
+                if compare == "hash":
+                    unchanged = _file_hash(source_path) == _file_hash(target_path)
+                else:
+                    unchanged = target_stat.st_mtime_ns == source_stat.st_mtime_ns
+                if unchanged:
+                    stats['unchanged'] += 1
+                    continue
+            
+            # Never write through an existing file: it may be shared with an
+            # earlier build generation
+            if target_stat is not None:
+                os.remove(target_path)
+            
+            try:
+                if not hardlink:
+                    raise OSError("hardlinks disabled")
+                os.link(source_path, target_path)
+                stats['linked'] += 1
+            except OSError:
+                shutil.copy2(source_path, target_path)
+                stats['copied'] += 1
+            stats['bytes'] += source_stat.st_size
+    
+    for root, dirs, filenames in os.walk(dest_dir, topdown=False):
+        rel_root = os.path.relpath(root, dest_dir)
+        for filename in filenames:
+            rel_path = os.path.normpath(os.path.join(rel_root, filename))
+            if rel_path in wanted:
+                continue
+            base_path = rel_path[:-3] if rel_path.endswith(('.gz', '.br')) else rel_path
+            if base_path in wanted or (keep and keep(base_path)):
+                continue
+            os.remove(os.path.join(root, filename))
+            stats['removed'] += 1
+        
+        if root != dest_dir and not os.listdir(root):
+            os.rmdir(root)
+    
+    return stats
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Build profiler for the MoneyMatrix.me static site pipeline
+Records wall time, CPU time, bytes written and file counts per build stage
+and per page type, and writes a JSON report
+
+Enable with --profile on auto_post.py or MONEYMATRIX_PROFILE=1. Add --cprofile
+(or MONEYMATRIX_CPROFILE=1) to also capture a cProfile dump of the build.
+"""
+
+import os
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from utils import logger
+
+class BuildProfiler:
+    """Opt-in timing and output accounting for site builds"""
+    
+    def __init__(self, enabled: bool = False, report_path: str = "build_profile.json",
+                 capture_cprofile: bool = False, top_n: int = 20):
+        self.enabled = enabled
+        self.report_path = report_path
+        self.capture_cprofile = capture_cprofile
+        self.top_n = top_n
+        self.reset()
+    
+    @classmethod
+    def from_env(cls, **kwargs) -> 'BuildProfiler':
+        """Profiler enabled by MONEYMATRIX_PROFILE / MONEYMATRIX_CPROFILE"""
+        kwargs.setdefault('enabled', os.getenv('MONEYMATRIX_PROFILE', '') not in ('', '0'))
+        kwargs.setdefault('capture_cprofile', os.getenv('MONEYMATRIX_CPROFILE', '') not in ('', '0'))
+        return cls(**kwargs)
+    
+    def reset(self):
+        """Forget everything recorded so far"""
+        self.stages = {}
+        self.page_types = {}
+        self.pages = []
+        self._stack = []
+        self._started = None
+    
+    def _stage_record(self, name: str) -> Dict:
+        return self.stages.setdefault(name, {
+            'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'bytes': 0, 'files': 0, 'calls': 0
+        })
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Time a build stage; nested stages are recorded as parent/child"""
+        if not self.enabled:
+            yield
+            return
+        
+        full_name = '/'.join(self._stack + [name])
+        self._stack.append(name)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record = self._stage_record(full_name)
+            record['wall_seconds'] += time.perf_counter() - wall_start
+            record['cpu_seconds'] += time.process_time() - cpu_start
+            record['calls'] += 1
+            self._stack.pop()
+    
+    def add_output(self, size: int, files: int = 1):
+        """Attribute written bytes and files to the current stage"""
+        if not self.enabled or not self._stack:
+            return
+        
+        record = self._stage_record('/'.join(self._stack))
+        record['bytes'] += size
+        record['files'] += files
+    
+    def add_file(self, file_path: str):
+        """Attribute a written file to the current stage"""
+        if self.enabled:
+            self.add_output(os.path.getsize(file_path))
+    
+    def record_page(self, page_type: str, rel_path: str, wall_seconds: float,
+                    cpu_seconds: float, file_path: str):
+        """Record the rendering cost and output size of one page"""
+        if not self.enabled:
+            return
+        
+        size = os.path.getsize(file_path)
+        record = self.page_types.setdefault(page_type, {
+            'pages': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'bytes': 0
+        })
+        record['pages'] += 1
+        record['wall_seconds'] += wall_seconds
+        record['cpu_seconds'] += cpu_seconds
+        record['bytes'] += size
+        
+        self.pages.append((wall_seconds, cpu_seconds, size, page_type, rel_path))
+    
+    @contextmanager
+    def build(self, name: str = "build"):
+        """Profile a whole build and write the report when it finishes.
+        
+        Inside another build this is just a nested stage, so the orchestrator
+        and HTMLGenerator can both wrap their build entry points.
+        """
+        if not self.enabled:
+            yield
+            return
+        
+        if self._stack:
+            with self.stage(name):
+                yield
+            return
+        
+        self.reset()
+        self._started = datetime.now()
+        
+        profile = None
+        if self.capture_cprofile:
+            import cProfile
+            profile = cProfile.Profile()
+            profile.enable()
+        
+        try:
+            with self.stage(name):
+                yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(self.cprofile_path())
+            self.write_report()
+    
+    def cprofile_path(self) -> str:
+        """Where the cProfile dump is written (next to the JSON report)"""
+        return os.path.splitext(self.report_path)[0] + ".prof"
+    
+    def slowest_pages(self, limit: Optional[int] = None) -> List[Dict]:
+        """Pages sorted by render wall time, slowest first"""
+        pages = sorted(self.pages, reverse=True)[:limit or self.top_n]
+        return [
+            {
+                'path': rel_path,
+                'type': page_type,
+                'wall_seconds': round(wall_seconds, 6),
+                'cpu_seconds': round(cpu_seconds, 6),
+                'bytes': size
+            }
+            for wall_seconds, cpu_seconds, size, page_type, rel_path in pages
+        ]
+    
+    def report(self) -> Dict:
+        """Build the JSON-serializable report"""
+        def rounded(record: Dict) -> Dict:
+            return {
+                key: round(value, 6) if isinstance(value, float) else value
+                for key, value in record.items()
+            }
+        
+        return {
+            'started_at': self._started.isoformat() if self._started else None,
+            'stages': {name: rounded(record) for name, record in self.stages.items()},
+            'page_types': {name: rounded(record) for name, record in self.page_types.items()},
+            'slowest_pages': self.slowest_pages(),
+            'cprofile': self.cprofile_path() if self.capture_cprofile else None
+        }
+    
+    def write_report(self):
+        """Write the JSON report and log a short summary"""
+        report = self.report()
+        
+        report_dir = os.path.dirname(self.report_path)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+        with open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        for name, record in report['stages'].items():
+            logger.info(
+                f"Profile {name}: {record['wall_seconds']:.3f}s wall, "
+                f"{record['cpu_seconds']:.3f}s CPU, {record['files']} files, {record['bytes']} bytes"
+            )
+        for page in report['slowest_pages'][:5]:
+            logger.info(f"Slow page {page['path']} ({page['type']}): {page['wall_seconds'] * 1000:.1f}ms")
+        
+        logger.info(f"Wrote build profile to {self.report_path}")
@@ -320,9 +320,9 @@ async function handleRequest(event) {
     response.headers.set('Referrer-Policy', 'unsafe-url')
     response.headers.set('Feature-Policy', 'none')
     
-    // Add caching headers
-    if (pathname.startsWith('/static/')) {
-      response.headers.set('Cache-Control', 'public, max-age=31536000')
+    // Add caching headers: fingerprinted assets (name.<hash>.ext) never change
+    if (/\\.[0-9a-f]{10}\\.[a-z0-9]+$/i.test(pathname)) {
+      response.headers.set('Cache-Control', 'public, max-age=31536000, immutable')
     } else {
       response.headers.set('Cache-Control', 'public, max-age=3600')
     }
@@ -444,6 +444,17 @@ class CloudflareKVUploader:
             "Content-Type": "application/json"
         }
     
+        self.fingerprinted = set()
+    
+    def load_asset_manifest(self, directory):
+        '''Read the fingerprinted asset keys written by the site build'''
+        try:
+            with open(os.path.join(directory, 'asset-manifest.json'), 'r') as f:
+                assets = json.load(f).get('assets', {})
+        except (OSError, ValueError):
+            assets = {}
+        self.fingerprinted = {url.lstrip('/') for url in assets.values()}
+    
     def upload_file(self, file_path, key):
         '''Upload a single file to KV storage'''
         
@@ -451,7 +462,12 @@ class CloudflareKVUploader:
             content = f.read()
         
         # Determine content type
-        content_type, _ = mimetypes.guess_type(file_path)
+        content_type, encoding = mimetypes.guess_type(file_path)
+        if encoding == 'gzip':
+            # e.g. sitemap-1.xml.gz: served as the archive itself
+            content_type = 'application/gzip'
+        elif encoding:
+            content_type = None
         if not content_type:
             content_type = 'application/octet-stream'
         
@@ -463,6 +479,9 @@ class CloudflareKVUploader:
             value = base64.b64encode(content).decode('utf-8')
             metadata = {"contentType": content_type, "encoding": "base64"}
         
+        if key in self.fingerprinted:
+            metadata["cacheControl"] = "public, max-age=31536000, immutable"
+        
         url = f"{self.base_url}/values/{key}"
         
         payload = {
@@ -484,6 +503,7 @@ class CloudflareKVUploader:
         
         uploaded = 0
         failed = 0
+        self.load_asset_manifest(directory)
         
         for root, dirs, files in os.walk(directory):
             for file in files:
@@ -221,13 +221,13 @@ class ContentGenerator:
         # This is a simplified version - can be enhanced with NLP
         
         # Find opportunities to add links
-        published_articles = self.data_manager.get_published_articles()
+        published_articles = self.data_manager.get_recent_articles(10, include_content=False)
         
         if not published_articles:
             return content
         
         # Look for keywords that match article titles
-        for article in published_articles[-10:]:  # Last 10 articles
+        for article in published_articles:  # 10 newest by date_published
             article_title = article.get('title', '')
             article_url = article.get('url', '')
             
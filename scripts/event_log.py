@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Append-only event log for MoneyMatrix.me data
+Events are appended to a JSONL file with batched fsyncs and replayed into
+memory at startup; compaction folds them into a snapshot in the background
+"""
+
+import os
+import re
+import atexit
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import json_codec
+from utils import file_lock, logger
+
+class EventLog:
+    """Durable state built by replaying events over a snapshot.
+    
+    On disk:
+        <name>.snapshot.json   state after every segment up to 'segment'
+        <name>.<n>.jsonl       sealed segments awaiting compaction
+        <name>.jsonl           the active segment new events are appended to
+    
+    Each segment starts with a {"segment":<n>} header naming the sealed segment
+    it follows; the number only grows, so it identifies the active file across
+    compactions even when the filesystem reuses an inode.
+    
+    apply(state, event) must be deterministic, so replaying the snapshot and
+    the remaining segments in order always rebuilds the same state. A torn
+    last line left by a crash mid-append is discarded during replay.
+    
+    Several processes may share a log. Appends, sealing and replay hold an
+    inter-process lock, and each process applies the events others appended
+    before writing its own. on_reload is called when a process had to replay
+    from the snapshot because another one compacted the log.
+    """
+    
+    SNAPSHOT_SEGMENT = re.compile(rb'^\{"segment":(\d+)')
+    SEGMENT_HEADER = re.compile(rb'^\{"segment":(\d+)\}\n$')
+    
+    def __init__(self, directory: str, name: str, apply: Callable[[Dict, Dict], None],
+                 initial_state: Callable[[], Dict], fsync_interval: float = 0.05,
+                 fsync_batch: int = 64, compact_every: int = 1000,
+                 on_reload: Optional[Callable[[], None]] = None):
+        self.directory = directory
+        self.name = name
+        self.apply = apply
+        self.initial_state = initial_state
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.compact_every = compact_every
+        self.on_reload = on_reload
+        
+        self.log_path = os.path.join(directory, f"{name}.jsonl")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot.json")
+        self._segment_pattern = re.compile(rf"^{re.escape(name)}\.(\d+)\.jsonl$")
+        
+        self._lock = threading.RLock()
+        self._compacting = None
+        self._unsynced = 0
+        self._events_since_compaction = 0
+        self._closed = threading.Event()
+        
+        os.makedirs(directory, exist_ok=True)
+        with file_lock(self.log_path):
+            self.state, self.segment = self._replay()
+            self._open_active()
+        
+        self._flusher = threading.Thread(target=self._flush_loop, name=f"{name}-fsync", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+    
+    def _open_active(self):
+        """Open the active segment for appending, writing its header if it is new;
+        the caller holds the file lock"""
+        self._file = open(self.log_path, 'ab')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            header = b'{"segment":%d}\n' % self.segment
+            self._file.write(header)
+            self._file.flush()
+            self._generation, self._offset = self.segment, len(header)
+        else:
+            self._generation, self._offset = self._active_segment()
+    
+    def _active_segment(self) -> Optional[tuple]:
+        """(header segment, size) of the active segment on disk, or None if it is
+        missing; the segment is None for a log written before headers existed"""
+        try:
+            with open(self.log_path, 'rb') as f:
+                match = self.SEGMENT_HEADER.match(f.readline())
+                size = os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return None
+        return (int(match.group(1)) if match else None), size
+    
+    def _sealed_segments(self) -> List[int]:
+        """Numbers of sealed segments on disk, oldest first"""
+        numbers = []
+        for filename in os.listdir(self.directory):
+            match = self._segment_pattern.match(filename)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+    
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{self.name}.{number}.jsonl")
+    
+    def _snapshot_segment(self) -> int:
+        """Segment the snapshot on disk covers, read from its first bytes"""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                match = self.SNAPSHOT_SEGMENT.match(f.read(64))
+        except FileNotFoundError:
+            return -1
+        return int(match.group(1)) if match else -1
+    
+    def _replay(self) -> tuple:
+        """Rebuild state from the snapshot and every segment written after it"""
+        try:
+            snapshot = json_codec.load_file(self.snapshot_path)
+            state, segment = snapshot['state'], snapshot['segment']
+        except FileNotFoundError:
+            state, segment = self.initial_state(), 0
+        
+        replayed = 0
+        for number in self._sealed_segments():
+            if number <= segment:
+                # Already folded into the snapshot; compaction died before removing it
+                os.remove(self._segment_path(number))
+                continue
+            replayed += self._replay_file(self._segment_path(number), state)
+            segment = max(segment, number)
+        
+        if os.path.exists(self.log_path):
+            replayed += self._replay_file(self.log_path, state)
+        self._events_since_compaction = replayed
+        
+        if replayed:
+            logger.info(f"Replayed {replayed} events from {self.name}")
+        return state, segment
+    
+    def _replay_file(self, path: str, state: Dict, offset: int = 0) -> int:
+        """Apply every complete event in path after offset.
+        
+        A torn final line is truncated away only when the whole file was
+        replayed; after a partial replay self._offset stops short of it instead.
+        """
+        count = 0
+        good_offset = offset
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                if good_offset == 0 and self.SEGMENT_HEADER.match(line):
+                    good_offset += len(line)
+                    continue
+                try:
+                    event = json_codec.loads(line)
+                except ValueError:
+                    break
+                self.apply(state, event)
+                good_offset += len(line)
+                count += 1
+        
+        if offset == 0 and good_offset != os.path.getsize(path):
+            logger.warning(f"Discarding a torn event at the end of {path}")
+            with open(path, 'r+b') as f:
+                f.truncate(good_offset)
+        
+        if path == self.log_path:
+            self._offset = good_offset
+        return count
+    
+    def _reload(self):
+        """Rebuild state from disk; the caller holds both locks"""
+        self._file.close()
+        self.state, self.segment = self._replay()
+        self._open_active()
+        if self.on_reload:
+            self.on_reload()
+    
+    def _catch_up(self):
+        """Apply events other processes logged; the caller holds both locks"""
+        active = self._active_segment()
+        
+        if active is None or active[0] != self._generation:
+            # Another process compacted the log: start again from its snapshot
+            self._reload()
+        elif active[1] > self._offset:
+            size = active[1]
+            count = self._replay_file(self.log_path, self.state, self._offset)
+            if self._offset < size:
+                # A writer died mid-event; a full replay trims the torn line
+                self._reload()
+            else:
+                self._events_since_compaction += count
+    
+    def refresh(self):
+        """Pick up events other processes logged since the last call"""
+        if self._active_segment() == (self._generation, self._offset):
+            return
+        
+        with self._lock, file_lock(self.log_path):
+            self._catch_up()
+    
+    def append(self, event_type: str, durable: bool = False, **payload) -> Dict:
+        """Apply an event to the in-memory state and append it to the log.
+        
+        The line reaches the OS immediately; fsyncs are batched by the
+        background flusher. Pass durable=True to fsync before returning.
+        """
+        event = {'type': event_type, 'at': datetime.now().isoformat(), **payload}
+        line = json_codec.dumps(event) + b'\n'
+        
+        with self._lock:
+            with file_lock(self.log_path):
+                self._catch_up()
+                
+                # Apply first: an event that cannot be applied must never reach the log
+                self.apply(self.state, event)
+                self._file.write(line)
+                self._file.flush()
+                self._offset += len(line)
+                self._unsynced += 1
+                self._events_since_compaction += 1
+                
+                if durable or self._unsynced >= self.fsync_batch:
+                    self._fsync()
+            
+            if self._events_since_compaction >= self.compact_every:
+                self.compact(background=True)
+        return event
+    
+    def is_empty(self) -> bool:
+        """True until the first snapshot or event is written"""
+        return not (self.segment or self._events_since_compaction or os.path.exists(self.snapshot_path))
+    
+    def seed(self, state: Dict) -> bool:
+        """Start a brand-new log from existing data by writing it as the snapshot"""
+        payload = json_codec.dumps({'segment': 0, 'state': state})
+        with self._lock, file_lock(self.log_path):
+            self._catch_up()
+            if not self.is_empty():
+                return False
+            self.state = state
+            self._install_snapshot(0, self._write_snapshot_file(payload))
+            return True
+    
+    def _fsync(self):
+        """fsync the active segment; the caller holds the lock"""
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+    
+    def flush(self):
+        """Make every appended event durable now"""
+        with self._lock:
+            self._fsync()
+    
+    def _flush_loop(self):
+        while not self._closed.wait(self.fsync_interval):
+            if self._unsynced:
+                self.flush()
+    
+    def compact(self, background: bool = False):
+        """Fold everything logged so far into a new snapshot.
+        
+        Sealing the active segment and serializing the state happen under the
+        locks. Writing the snapshot does not block appends, which continue
+        into a fresh active segment.
+        """
+        with self._lock:
+            if self._compacting is not None and self._compacting.is_alive():
+                return
+            
+            with file_lock(self.log_path):
+                self._catch_up()
+                if self._events_since_compaction == 0:
+                    return
+                
+                self._fsync()
+                self._file.close()
+                self.segment += 1
+                os.replace(self.log_path, self._segment_path(self.segment))
+                self._open_active()
+                self._events_since_compaction = 0
+                
+                segment = self.segment
+                # 'segment' comes first so _snapshot_segment can read it cheaply
+                payload = json_codec.dumps({'segment': segment, 'state': self.state})
+        
+        if background:
+            self._compacting = threading.Thread(
+                target=self._write_snapshot, args=(segment, payload), name=f"{self.name}-compact", daemon=True
+            )
+            self._compacting.start()
+        else:
+            self._write_snapshot(segment, payload)
+    
+    def _write_snapshot_file(self, payload: bytes) -> str:
+        """Write payload to a durable temp file next to the snapshot"""
+        temp_path = f"{self.snapshot_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        return temp_path
+    
+    def _write_snapshot(self, segment: int, payload: bytes):
+        temp_path = self._write_snapshot_file(payload)
+        with file_lock(self.log_path):
+            self._install_snapshot(segment, temp_path)
+        logger.info(f"Wrote {self.name} snapshot ({len(payload)} bytes)")
+    
+    def _install_snapshot(self, segment: int, temp_path: str):
+        """Move a written snapshot into place unless another process installed a
+        newer one, then drop the segments it covers; the caller holds the file lock"""
+        if self._snapshot_segment() > segment:
+            os.remove(temp_path)
+            return
+        
+        os.replace(temp_path, self.snapshot_path)
+        for number in self._sealed_segments():
+            if number <= segment:
+                os.remove(self._segment_path(number))
+    
+    def close(self):
+        """Flush, wait for a running compaction and stop the flusher"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        with self._lock:
+            self._fsync()
+            self._file.close()
+        if self._compacting is not None:
+            self._compacting.join()
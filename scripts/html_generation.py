@@ -1,13 +1,20 @@
 import os
 import json
 import random
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from typing import Any, Callable, Dict, List, Optional
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape, meta
 from utils import (
     ContentUtils, SEOUtils, DataManager, ConfigManager, 
-    PromptManager, logger
+    PromptManager, ArticleIndex, logger
 )
+from build_cache import BuildCache, seed_from_directory, sync_directory
+from build_profiler import BuildProfiler
+from output_writer import OutputWriter
+from sitemap_writer import SitemapWriter, MAX_URLS_PER_SITEMAP, article_lastmod
 
 class HTMLGenerator:
     """Generates HTML content for articles and pages"""
@@ -18,11 +25,9 @@ class HTMLGenerator:
         self.data_manager = DataManager()
         self.config_manager = ConfigManager()
         
-        # Setup Jinja2 environment
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(self.templates_dir),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        # Setup Jinja2 environment; compiled templates persist across runs
+        self.bytecode_cache_dir = self.config_manager.get('performance.template_cache_dir', '.cache/jinja2')
+        self.jinja_env = self.create_jinja_env(self.templates_dir, self.bytecode_cache_dir)
         
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
@@ -30,6 +35,53 @@ class HTMLGenerator:
         # Load data
         self.categories = self.data_manager.get_categories()
         self.topics = self.data_manager.get_topics()
+        
+        # Set for the duration of a build so every page shares one parse of the data
+        self.article_index = None
+        self.output_writer = None
+        self._template_hashes = {}
+        
+        # Original -> fingerprinted URLs for static assets, set by sync_static_assets
+        self.asset_manifest = {}
+        
+        # Opt-in stage timing; see build_profiler.py
+        self.profiler = BuildProfiler.from_env()
+    
+    @staticmethod
+    def create_jinja_env(templates_dir: str, bytecode_cache_dir: Optional[str] = None) -> Environment:
+        """Create the Jinja2 environment pages are rendered with.
+        
+        With a bytecode cache directory, compiled templates are stored on disk keyed
+        by a checksum of their source, so later runs skip compilation entirely.
+        """
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+        
+        return Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=select_autoescape(['html', 'xml']),
+            bytecode_cache=bytecode_cache
+        )
+    
+    @classmethod
+    def renderer(cls, templates_dir: str, categories: List[Dict], topics: List[Dict],
+                 bytecode_cache_dir: Optional[str] = None) -> 'HTMLGenerator':
+        """Render-only generator built from a data snapshot, for pool workers.
+        
+        It has no data or config manager, so it can only render tasks whose
+        inputs are carried in the task itself.
+        """
+        generator = cls.__new__(cls)
+        generator.templates_dir = templates_dir
+        generator.bytecode_cache_dir = bytecode_cache_dir
+        generator.jinja_env = cls.create_jinja_env(templates_dir, bytecode_cache_dir)
+        generator.categories = categories
+        generator.topics = topics
+        generator.article_index = None
+        generator.asset_manifest = {}
+        return generator
     
     def generate_article_html(self, article_data: Dict) -> str:
         """Generate HTML for a single article"""
@@ -62,17 +114,13 @@ class HTMLGenerator:
         
         return template.render(**template_data)
     
-    def generate_homepage(self) -> str:
+    def generate_homepage(self, recent_articles: Optional[List[Dict]] = None) -> str:
         """Generate homepage HTML"""
         template = self.jinja_env.get_template('homepage.html')
         
         # Get recent articles
-        published_articles = self.data_manager.get_published_articles()
-        recent_articles = sorted(
-            published_articles, 
-            key=lambda x: x.get('date_published', ''), 
-            reverse=True
-        )[:6]
+        if recent_articles is None:
+            recent_articles = self.get_article_index().recent(6)
         
         # Get featured categories
         featured_categories = self.categories[:8]  # First 8 categories
@@ -89,7 +137,7 @@ class HTMLGenerator:
         
         return template.render(**template_data)
     
-    def generate_category_page(self, category_slug: str) -> str:
+    def generate_category_page(self, category_slug: str, category_articles: Optional[List[Dict]] = None) -> str:
         """Generate category listing page"""
         template = self.jinja_env.get_template('category.html')
         
@@ -98,18 +146,8 @@ class HTMLGenerator:
             return ""
         
         # Get articles for this category
-        published_articles = self.data_manager.get_published_articles()
-        category_articles = [
-            article for article in published_articles 
-            if article.get('category_slug') == category_slug
-        ]
-        
-        # Sort by date
-        category_articles = sorted(
-            category_articles,
-            key=lambda x: x.get('date_published', ''),
-            reverse=True
-        )
+        if category_articles is None:
+            category_articles = self.get_article_index().in_category(category_slug)
         
         template_data = {
             'title': f"{category['name']} - MoneyMatrix.me",
@@ -123,51 +161,38 @@ class HTMLGenerator:
         
         return template.render(**template_data)
     
-    def generate_sitemap(self) -> str:
-        """Generate XML sitemap"""
-        published_articles = self.data_manager.get_published_articles()
-        
-        sitemap_content = ['<?xml version="1.0" encoding="UTF-8"?>']
-        sitemap_content.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
-        
-        # Homepage
-        sitemap_content.append('<url>')
-        sitemap_content.append('<loc>https://moneymatrix.me</loc>')
-        sitemap_content.append(f'<lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-        sitemap_content.append('<changefreq>daily</changefreq>')
-        sitemap_content.append('<priority>1.0</priority>')
-        sitemap_content.append('</url>')
+    def get_article_index(self) -> ArticleIndex:
+        """The build's article index, or a freshly loaded one outside a build"""
+        if self.article_index is not None:
+            return self.article_index
+        return self.data_manager.get_article_index()
+    
+    def write_sitemap(self) -> Dict[str, int]:
+        """Stream the sitemap index and its numbered sitemap files into the output"""
+        article_index = self.get_article_index()
+        base_url = self.config_manager.get('site.url', 'https://moneymatrix.me')
         
-        # Category pages
-        for category in self.categories:
-            sitemap_content.append('<url>')
-            sitemap_content.append(f'<loc>https://moneymatrix.me/{category["slug"]}</loc>')
-            sitemap_content.append(f'<lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-            sitemap_content.append('<changefreq>weekly</changefreq>')
-            sitemap_content.append('<priority>0.8</priority>')
-            sitemap_content.append('</url>')
-        
-        # Articles
-        for article in published_articles:
-            sitemap_content.append('<url>')
-            sitemap_content.append(f'<loc>{article.get("url", "")}</loc>')
+        writer = SitemapWriter(
+            self.output_dir, base_url,
+            max_urls=self.config_manager.get('seo.sitemap_max_urls', MAX_URLS_PER_SITEMAP),
+            compress=self.config_manager.get('seo.sitemap_gzip', False)
+        )
+        with writer:
+            # Listing pages change whenever their newest article does
+            article_dates = [article_lastmod(article) for article in article_index]
+            writer.add(base_url, max(filter(None, article_dates), default=None), 'daily', '1.0')
             
-            # Parse date
-            date_published = article.get('date_published', '')
-            if date_published:
-                try:
-                    date_obj = datetime.fromisoformat(date_published.replace('Z', '+00:00'))
-                    sitemap_content.append(f'<lastmod>{date_obj.strftime("%Y-%m-%d")}</lastmod>')
-                except:
-                    sitemap_content.append(f'<lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
+            for category in self.categories:
+                category_dates = [article_lastmod(article) for article in article_index.in_category(category['slug'])]
+                writer.add(f"{base_url}/{category['slug']}", max(filter(None, category_dates), default=None), 'weekly', '0.8')
             
-            sitemap_content.append('<changefreq>monthly</changefreq>')
-            sitemap_content.append('<priority>0.7</priority>')
-            sitemap_content.append('</url>')
-        
-        sitemap_content.append('</urlset>')
+            # Articles last, in publishing order, so new ones only touch the last sitemap file
+            for article in article_index:
+                if article.get('url'):
+                    writer.add(article['url'], article_lastmod(article), 'monthly', '0.7')
         
-        return '\n'.join(sitemap_content)
+        self.profiler.add_output(writer.stats['bytes'], writer.stats['written'])
+        return writer.stats
     
     def generate_robots_txt(self) -> str:
         """Generate robots.txt file"""
@@ -185,18 +210,18 @@ class HTMLGenerator:
         return '\n'.join(robots_content)
     
     def save_html_file(self, content: str, filename: str, subdirectory: str = ""):
-        """Save HTML content to file"""
-        if subdirectory:
-            output_path = os.path.join(self.output_dir, subdirectory)
-            os.makedirs(output_path, exist_ok=True)
-            filepath = os.path.join(output_path, filename)
-        else:
-            filepath = os.path.join(self.output_dir, filename)
+        """Save HTML content to file atomically, skipping unchanged content"""
+        rel_path = os.path.join(subdirectory, filename) if subdirectory else filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # During a build the writer is shared and logs one summary line at the end
+        writer = self.output_writer or OutputWriter(self.output_dir)
+        written = writer.write(rel_path, content)
+        if written:
+            self.profiler.add_file(written)
         
-        logger.info(f"Saved HTML file: {filepath}")
+        if self.output_writer is None:
+            logger.info(f"Saved HTML file: {os.path.join(self.output_dir, rel_path)}")
+        return os.path.join(self.output_dir, rel_path)
     
     def create_article_page(self, article_data: Dict) -> str:
         """Create complete article page and save to disk"""
@@ -218,12 +243,16 @@ class HTMLGenerator:
     def create_all_category_pages(self):
         """Create all category listing pages"""
         for category in self.categories:
-            html_content = self.generate_category_page(category['slug'])
-            if html_content:
-                # Save as .html file but URLs won't have .html
-                filename = f"{category['slug']}.html"
-                self.save_html_file(html_content, filename)
-                logger.info(f"Created category page: {category['name']}")
+            self.create_category_page(category)
+    
+    def create_category_page(self, category: Dict):
+        """Create a single category listing page"""
+        html_content = self.generate_category_page(category['slug'])
+        if html_content:
+            # Save as .html file but URLs won't have .html
+            filename = f"{category['slug']}.html"
+            self.save_html_file(html_content, filename)
+            logger.info(f"Created category page: {category['name']}")
     
     def create_homepage(self):
         """Create homepage"""
@@ -233,8 +262,7 @@ class HTMLGenerator:
     
     def create_sitemap(self):
         """Create XML sitemap"""
-        sitemap_content = self.generate_sitemap()
-        self.save_html_file(sitemap_content, "sitemap.xml")
+        self.write_sitemap()
         logger.info("Created sitemap")
     
     def create_robots_txt(self):
@@ -244,37 +272,424 @@ class HTMLGenerator:
         logger.info("Created robots.txt")
     
     def copy_static_files(self):
-        """Copy static files to output directory"""
-        import shutil
+        """Sync static files to output directory, copying only what changed"""
+        from performance_optimizer import FINGERPRINT_PATTERN
         
         static_source = "static"
         static_dest = os.path.join(self.output_dir, "static")
         
         if os.path.exists(static_source):
-            if os.path.exists(static_dest):
-                shutil.rmtree(static_dest)
-            shutil.copytree(static_source, static_dest)
-            logger.info("Copied static files")
+            stats = sync_directory(
+                static_source, static_dest,
+                compare=self.config_manager.get('performance.static_sync_compare', 'mtime'),
+                hardlink=self.config_manager.get('performance.hardlink_static_files', False),
+                # Fingerprinted copies are pruned by fingerprint_assets instead
+                keep=FINGERPRINT_PATTERN.search
+            )
+            self.profiler.add_output(stats['bytes'], stats['linked'] + stats['copied'])
+            logger.info(
+                f"Synced static files ({stats['linked']} linked, {stats['copied']} copied, "
+                f"{stats['unchanged']} unchanged, {stats['removed']} removed)"
+            )
     
-    def build_complete_site(self):
-        """Build the complete static site"""
+    def build_complete_site(self, full_rebuild: bool = False):
+        """Build the complete static site.
+        
+        With deployment.atomic_swap enabled the site is rendered into a fresh
+        generation directory and output_dir is switched to it in one rename once
+        the build is complete, so a running server never reads half-written pages.
+        
+        Unless full_rebuild is set, only pages whose inputs changed since the last
+        build are rendered; the rest are hardlinked from the previous generation.
+        Rendered pages identical to the previous output are not rewritten.
+        """
+        with self.profiler.build("build_complete_site"):
+            self._build_generation(lambda: self._build_site_files(full_rebuild))
+    
+    def _build_generation(self, build: Callable[[], Any]) -> Any:
+        """Run build against output_dir and return its result.
+        
+        With deployment.atomic_swap enabled, output_dir points at a new
+        generation seeded from the live one while build runs; the generation is
+        published once build returns and discarded if it raises.
+        """
+        if not self.config_manager.get('deployment.atomic_swap', True):
+            return build()
+        
+        site_dir = self.output_dir
+        generation_dir = self.begin_generation(site_dir)
+        self.output_dir = generation_dir
+        try:
+            # Seed even for full rebuilds: unchanged output then keeps its mtime
+            if os.path.isdir(site_dir):
+                with self.profiler.stage("seed"):
+                    seeded = seed_from_directory(os.path.realpath(site_dir), generation_dir)
+                logger.info(f"Seeded build generation with {seeded} files from {site_dir}")
+            result = build()
+        except Exception:
+            shutil.rmtree(generation_dir, ignore_errors=True)
+            raise
+        finally:
+            self.output_dir = site_dir
+        
+        with self.profiler.stage("publish"):
+            self.publish_generation(generation_dir, site_dir)
+            self.prune_generations(site_dir, self.config_manager.get('deployment.keep_generations', 3))
+        return result
+    
+    def _build_site_files(self, full_rebuild: bool = False):
+        """Render changed pages and build artifacts into output_dir"""
         logger.info("Starting complete site build...")
         
-        # Create all pages
-        self.create_homepage()
-        self.create_all_category_pages()
-        self.create_sitemap()
-        self.create_robots_txt()
+        build_cache = BuildCache(self.output_dir)
+        self._template_hashes = {}
+        self.article_index = self.data_manager.get_article_index()
+        self.output_writer = OutputWriter(self.output_dir)
+        try:
+            self._write_site_files(build_cache, full_rebuild)
+        finally:
+            self.article_index = None
+            self.output_writer = None
+    
+    def _write_site_files(self, build_cache: BuildCache, full_rebuild: bool):
+        """Write changed pages, then the artifacts derived from the whole output"""
+        # Static assets first: pages embed their fingerprinted URLs
+        self.sync_static_assets()
+        
+        planned_count, changed_paths = self._write_changed_pages(build_cache, full_rebuild)
+        with self.profiler.stage("sitemap"):
+            self.write_sitemap()
+        
+        # Write precompressed variants and content hashes for the server
+        if self.config_manager.get('deployment.enable_compression', True):
+            with self.profiler.stage("precompress"):
+                self.precompress_output()
+        with self.profiler.stage("etag_manifest"):
+            self.write_etag_manifest()
+        
+        build_cache.save()
+        self.write_build_generation()
+        
+        self.output_writer.log_summary()
+        logger.info(
+            f"Site build complete. Rendered {len(changed_paths)} of {planned_count} pages "
+            f"({planned_count - len(changed_paths)} unchanged)."
+        )
+    
+    def _write_changed_pages(self, build_cache: BuildCache, full_rebuild: bool) -> tuple:
+        """Render and write pages whose inputs changed; return (planned count, changed paths)"""
+        from performance_optimizer import PerformanceOptimizer
+        
+        with self.profiler.stage("plan"):
+            planned_pages = self.plan_pages()
+            changed_pages = []
+            unchanged_paths = []
+            for rel_path, input_hash, task in planned_pages:
+                build_cache.record(rel_path, input_hash)
+                if full_rebuild or not build_cache.is_current(rel_path, input_hash):
+                    changed_pages.append((rel_path, task))
+                else:
+                    unchanged_paths.append(rel_path)
+        
+        with self.profiler.stage("render"):
+            rendered = self.render_tasks([task for _, task in changed_pages])
+        
+        # Pages are written by this process in plan order, however they were rendered
+        with self.profiler.stage("write"):
+            for (rel_path, task), (content, wall_seconds, cpu_seconds) in zip(changed_pages, rendered):
+                if rel_path.endswith('.html'):
+                    build_cache.record_assets(
+                        rel_path, PerformanceOptimizer.asset_references(content, self.asset_manifest)
+                    )
+                    content = self.rewrite_asset_urls(content)
+                subdirectory, filename = os.path.split(rel_path)
+                filepath = self.save_html_file(content, filename, subdirectory)
+                self.profiler.record_page(task[0], rel_path, wall_seconds, cpu_seconds, filepath)
+            
+            repointed = self._repoint_asset_urls(build_cache, unchanged_paths)
+            if repointed:
+                logger.info(f"Re-pointed {repointed} unchanged pages at changed assets")
+            
+            build_cache.remove_stale_pages()
+        
+        return len(planned_pages), [rel_path for rel_path, _ in changed_pages]
+    
+    def _repoint_asset_urls(self, build_cache: BuildCache, rel_paths: List[str]) -> int:
+        """Update asset URLs in unchanged pages whose assets got new fingerprints.
+        
+        Only the URLs recorded for a page that differ from the current manifest
+        are substituted in the page already on disk; nothing is re-rendered.
+        """
+        from performance_optimizer import PerformanceOptimizer
+        
+        repointed = 0
+        for rel_path in rel_paths:
+            written = build_cache.previous_assets.get(rel_path, {})
+            current = {url: self.asset_manifest.get(url, url) for url in written}
+            remap = {written[url]: current[url] for url in written if written[url] != current[url]}
+            
+            if remap:
+                with open(os.path.join(self.output_dir, rel_path), 'r', encoding='utf-8') as f:
+                    content = f.read()
+                subdirectory, filename = os.path.split(rel_path)
+                self.save_html_file(PerformanceOptimizer.rewrite_asset_urls(content, remap), filename, subdirectory)
+                repointed += 1
+            build_cache.record_assets(rel_path, current)
+        
+        return repointed
+    
+    def rebuild_changed_pages(self, pages: bool = True, static: bool = True) -> List[str]:
+        """Re-render only the pages whose inputs changed (watch mode).
+        
+        The update is published like build_complete_site: into a new generation
+        swapped in once it is complete, with precompressed variants and the ETag
+        manifest brought up to date, so a published generation never changes.
+        """
+        return self._build_generation(lambda: self._rebuild_site_files(pages, static))
+    
+    def _rebuild_site_files(self, pages: bool, static: bool) -> List[str]:
+        """Bring output_dir up to date after pages and/or static inputs changed"""
+        if static:
+            self.sync_static_assets()
+        else:
+            from performance_optimizer import PerformanceOptimizer
+            
+            self.asset_manifest = PerformanceOptimizer().load_asset_manifest(self.output_dir).get('assets', {})
+        
+        # Categories and topics may have been edited since the last rebuild
+        self.categories = self.data_manager.get_categories()
+        self.topics = self.data_manager.get_topics()
+        
+        # Pages embed asset URLs, so a static change can re-point them too
+        build_cache = BuildCache(self.output_dir)
+        self._template_hashes = {}
+        self.article_index = self.data_manager.get_article_index()
+        self.output_writer = OutputWriter(self.output_dir)
+        try:
+            _, changed_paths = self._write_changed_pages(build_cache, full_rebuild=False)
+            self.write_sitemap()
+            
+            if self.config_manager.get('deployment.enable_compression', True):
+                self.precompress_output()
+            self.write_etag_manifest()
+            
+            build_cache.save()
+            self.write_build_generation()
+        finally:
+            self.article_index = None
+            self.output_writer = None
+        
+        return changed_paths
+    
+    def plan_pages(self) -> List[tuple]:
+        """List (output path, input hash, render task) for every page of the site.
+        
+        The hash covers everything the page is rendered from, so listing pages
+        change whenever one of the articles they show does. Tasks carry their
+        own inputs so they can be rendered in another process.
+        """
+        article_index = self.get_article_index()
+        # Asset URLs are not inputs: _write_changed_pages rewrites them after rendering
+        site_inputs = (self.config_manager.get('site', {}), self.categories)
+        pages = []
+        
+        recent_articles = article_index.recent(6)
+        pages.append((
+            "index.html",
+            BuildCache.hash_inputs(self.template_hash('homepage.html'), site_inputs, recent_articles),
+            ('homepage', recent_articles)
+        ))
+        
+        for category in self.categories:
+            category_articles = article_index.in_category(category['slug'])
+            pages.append((
+                f"{category['slug']}.html",
+                BuildCache.hash_inputs(self.template_hash('category.html'), site_inputs, category, category_articles),
+                ('category', category['slug'], category_articles)
+            ))
+        
+        robots_content = self.generate_robots_txt()
+        pages.append(("robots.txt", BuildCache.hash_inputs(robots_content), ('robots', robots_content)))
+        
+        for article in article_index:
+            category_slug = article.get('category_slug', '')
+            article_slug = article.get('slug', '')
+            if not (category_slug and article_slug):
+                continue
+            
+            pages.append((
+                f"{category_slug}/{article_slug}.html",
+                BuildCache.hash_inputs(
+                    self.template_hash('article.html'), site_inputs, article,
+                    self.get_category_by_slug(category_slug)
+                ),
+                ('article', article)
+            ))
+        
+        return pages
+    
+    def render_task_timed(self, task: tuple) -> tuple:
+        """Render one planned page, returning (content, wall seconds, CPU seconds)"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        content = self.render_task(task)
+        return content, time.perf_counter() - wall_start, time.process_time() - cpu_start
+    
+    def render_task(self, task: tuple) -> str:
+        """Render one planned page"""
+        kind = task[0]
+        if kind == 'article':
+            return self.generate_article_html(task[1])
+        if kind == 'category':
+            return self.generate_category_page(task[1], task[2])
+        if kind == 'homepage':
+            return self.generate_homepage(task[1])
+        return task[1]
+    
+    def render_tasks(self, tasks: List[tuple]) -> List[tuple]:
+        """Render tasks in order, sharding article and category pages across
+        worker processes for large builds. Returns render_task_timed results."""
+        parallel = [index for index, task in enumerate(tasks) if task[0] in ('article', 'category')]
+        workers = self.config_manager.get('performance.build_workers', 0) or os.cpu_count() or 1
+        workers = min(workers, len(parallel))
+        min_pages = self.config_manager.get('performance.parallel_build_min_pages', 200)
+        
+        if workers < 2 or len(parallel) < min_pages:
+            return [self.render_task_timed(task) for task in tasks]
+        
+        logger.info(f"Rendering {len(parallel)} pages with {workers} worker processes")
+        results = [None] * len(tasks)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(self.templates_dir, self.categories, self.topics, self.bytecode_cache_dir)
+        ) as executor:
+            chunksize = max(1, len(parallel) // (workers * 4))
+            rendered = executor.map(_render_in_worker, [tasks[index] for index in parallel], chunksize=chunksize)
+            
+            # The homepage and robots.txt render here in the meantime
+            for index, task in enumerate(tasks):
+                if task[0] not in ('article', 'category'):
+                    results[index] = self.render_task_timed(task)
+            
+            for index, content in zip(parallel, rendered):
+                results[index] = content
         
-        # Copy static files
-        self.copy_static_files()
+        return results
+    
+    def template_hash(self, template_name: str) -> str:
+        """Hash of a template's source and every template it extends or includes"""
+        if template_name in self._template_hashes:
+            return self._template_hashes[template_name]
         
-        # Create article pages for all published articles
-        published_articles = self.data_manager.get_published_articles()
-        for article in published_articles:
-            self.create_article_page(article)
+        # Guard against cycles while the hash is being computed
+        self._template_hashes[template_name] = ''
+        try:
+            source, _, _ = self.jinja_env.loader.get_source(self.jinja_env, template_name)
+        except Exception:
+            return ''
+        
+        parts = [source]
+        for referenced in sorted(filter(None, meta.find_referenced_templates(self.jinja_env.parse(source)))):
+            parts.append(self.template_hash(referenced))
+        
+        self._template_hashes[template_name] = BuildCache.hash_inputs(parts)
+        return self._template_hashes[template_name]
+    
+    def sync_static_assets(self):
+        """Sync static files, then fingerprint them if enabled"""
+        with self.profiler.stage("copy_static_files"):
+            self.copy_static_files()
+        
+        if self.config_manager.get('performance.fingerprint_assets', True):
+            from performance_optimizer import PerformanceOptimizer
+            
+            with self.profiler.stage("fingerprint_assets"):
+                self.asset_manifest = PerformanceOptimizer().fingerprint_assets(self.output_dir)
+        else:
+            self.asset_manifest = {}
+    
+    def rewrite_asset_urls(self, html_content: str) -> str:
+        """Point static asset references at their fingerprinted URLs"""
+        from performance_optimizer import PerformanceOptimizer
         
-        logger.info(f"Site build complete. Generated {len(published_articles)} article pages.")
+        if not self.asset_manifest:
+            return html_content
+        return PerformanceOptimizer.rewrite_asset_urls(html_content, self.asset_manifest)
+    
+    def precompress_output(self):
+        """Write .gz/.br siblings for compressible files in the output directory"""
+        from performance_optimizer import PerformanceOptimizer
+        
+        stats = PerformanceOptimizer().precompress_directory(self.output_dir)
+        self.profiler.add_output(stats['bytes'], stats['gzip'] + stats['brotli'])
+    
+    def write_etag_manifest(self):
+        """Record content hashes the server uses as strong ETags"""
+        from performance_optimizer import PerformanceOptimizer
+        
+        PerformanceOptimizer().write_etag_manifest(self.output_dir)
+    
+    def write_build_generation(self):
+        """Record a new build generation so running servers drop their in-memory caches"""
+        generation = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        self.save_html_file(generation, ".build-generation")
+    
+    def generations_dir(self, site_dir: str) -> str:
+        """Directory holding the immutable build generations behind site_dir"""
+        return os.path.normpath(site_dir) + "-generations"
+    
+    def begin_generation(self, site_dir: str) -> str:
+        """Create an empty directory for the next build generation"""
+        generation_dir = os.path.join(
+            self.generations_dir(site_dir),
+            datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        )
+        os.makedirs(generation_dir)
+        return generation_dir
+    
+    def publish_generation(self, generation_dir: str, site_dir: str):
+        """Atomically point site_dir at a finished generation"""
+        site_dir = os.path.normpath(site_dir)
+        
+        # One-time migration: a plain directory cannot be swapped atomically, so
+        # keep it around as a generation of its own and replace it with a symlink
+        if os.path.isdir(site_dir) and not os.path.islink(site_dir) and not os.listdir(site_dir):
+            os.rmdir(site_dir)
+        elif os.path.isdir(site_dir) and not os.path.islink(site_dir):
+            legacy_dir = os.path.join(
+                self.generations_dir(site_dir),
+                f"legacy-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            )
+            os.rename(site_dir, legacy_dir)
+            logger.info(f"Moved existing {site_dir} to {legacy_dir}")
+        
+        target = os.path.relpath(generation_dir, os.path.dirname(os.path.abspath(site_dir)))
+        temp_link = f"{site_dir}.tmp-{os.getpid()}"
+        if os.path.lexists(temp_link):
+            os.remove(temp_link)
+        os.symlink(target, temp_link)
+        os.replace(temp_link, site_dir)
+        
+        logger.info(f"Published build generation {target} as {site_dir}")
+    
+    def prune_generations(self, site_dir: str, keep: int = 3):
+        """Delete old generations, keeping the newest ones and the live target"""
+        generations_dir = self.generations_dir(site_dir)
+        live_dir = os.path.realpath(site_dir)
+        # Keep at least the previous generation: servers may still be serving it
+        keep = max(int(keep), 2)
+        
+        generations = sorted(
+            (os.path.join(generations_dir, name) for name in os.listdir(generations_dir)),
+            key=os.path.getmtime,
+            reverse=True
+        )
+        for generation_dir in generations[keep:]:
+            if os.path.realpath(generation_dir) == live_dir:
+                continue
+            shutil.rmtree(generation_dir, ignore_errors=True)
+            logger.info(f"Removed old build generation: {generation_dir}")
     
     def get_category_by_slug(self, slug: str) -> Optional[Dict]:
         """Get category by slug"""
@@ -294,13 +709,49 @@ class HTMLGenerator:
         except:
             return date_string
 
+# Render-only generator of the current pool worker process
+_worker_renderer = None
+
+def _init_render_worker(templates_dir: str, categories: List[Dict], topics: List[Dict],
+                        bytecode_cache_dir: Optional[str] = None):
+    """Process pool initializer: one Jinja environment and data snapshot per worker"""
+    global _worker_renderer
+    _worker_renderer = HTMLGenerator.renderer(templates_dir, categories, topics, bytecode_cache_dir)
+
+def _render_in_worker(task: tuple) -> tuple:
+    """Render a planned page in a pool worker"""
+    return _worker_renderer.render_task_timed(task)
+
 class TemplateManager:
     """Manages additional template creation"""
     
     def __init__(self, templates_dir: str = "templates"):
         self.templates_dir = templates_dir
+        self.templates_written = 0
         os.makedirs(self.templates_dir, exist_ok=True)
     
+    def write_template(self, filename: str, template_content: str) -> bool:
+        """Write a template only if its content changed.
+        
+        Leaving unchanged files alone keeps their mtime, so Jinja's loader and
+        bytecode cache and the incremental build all see them as up to date.
+        """
+        template_path = os.path.join(self.templates_dir, filename)
+        try:
+            with open(template_path, 'r') as f:
+                if f.read() == template_content:
+                    return False
+        except OSError:
+            pass
+        
+        temp_path = f"{template_path}.tmp-{os.getpid()}"
+        with open(temp_path, 'w') as f:
+            f.write(template_content)
+        os.replace(temp_path, template_path)
+        
+        self.templates_written += 1
+        return True
+    
     def create_homepage_template(self):
         """Create homepage template"""
         template_content = """{% extends "base.html" %}
@@ -509,8 +960,7 @@ class TemplateManager:
 </style>
 {% endblock %}"""
         
-        with open(os.path.join(self.templates_dir, 'homepage.html'), 'w') as f:
-            f.write(template_content)
+        self.write_template('homepage.html', template_content)
     
     def create_category_template(self):
         """Create category listing template"""
@@ -659,14 +1109,18 @@ class TemplateManager:
 </style>
 {% endblock %}"""
         
-        with open(os.path.join(self.templates_dir, 'category.html'), 'w') as f:
-            f.write(template_content)
+        self.write_template('category.html', template_content)
     
     def create_all_templates(self):
         """Create all missing templates"""
+        self.templates_written = 0
         self.create_homepage_template()
         self.create_category_template()
-        logger.info("Created additional templates")
+        
+        if self.templates_written:
+            logger.info(f"Created additional templates ({self.templates_written} updated)")
+        else:
+            logger.info("Additional templates up to date")
 
 if __name__ == "__main__":
     # Create templates if they don't exist
@@ -1,6 +1,5 @@
 import requests
 import os
-import json
 import time
 import hashlib
 from typing import Dict, List, Optional, Tuple
@@ -113,20 +112,18 @@ class ImageHandler:
     
     def load_processed_images(self) -> Dict:
         """Load cache of processed images"""
-        cache_file = os.path.join('data', 'processed_images.json')
-        
-        try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        return self.data_manager.load_json('processed_images.json', mutable=True)
     
-    def save_processed_images(self):
-        """Save processed images cache"""
-        cache_file = os.path.join('data', 'processed_images.json')
+    def save_processed_images(self, article_slug: Optional[str] = None):
+        """Save processed images cache, keeping entries other processes added meanwhile"""
+        def merge(data: Dict):
+            if article_slug is None:
+                data.update(self.processed_images)
+            else:
+                data[article_slug] = self.processed_images[article_slug]
+            return data
         
-        with open(cache_file, 'w') as f:
-            json.dump(self.processed_images, f, indent=2)
+        self.processed_images = self.data_manager.update_json('processed_images.json', merge)
     
     def generate_search_terms(self, article_data: Dict) -> List[str]:
         """Generate search terms for finding relevant images"""
@@ -287,19 +284,25 @@ class ImageHandler:
         if os.path.exists(filepath):
             return True
         
+        # Download to a temp file and rename: the build may hardlink static files,
+        # so a file in static/ must never be written in place
+        temp_path = f"{filepath}.tmp-{os.getpid()}"
         try:
             response = requests.get(download_url, stream=True)
             response.raise_for_status()
             
-            with open(filepath, 'wb') as f:
+            with open(temp_path, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
+            os.replace(temp_path, filepath)
             
             logger.info(f"Downloaded image: {filename}")
             return True
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to download image {filename}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
             return False
     
     def generate_alt_text(self, image_data: Dict, article_context: Dict) -> str:
@@ -369,7 +372,7 @@ class ImageHandler:
             'search_terms': search_terms
         }
         
-        self.save_processed_images()
+        self.save_processed_images(article_slug)
         
         logger.info(f"Processed {len(processed_images)} images for {article_slug}")
         
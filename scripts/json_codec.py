@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+JSON encoding and decoding for MoneyMatrix.me data files
+Uses orjson when it is installed and the standard library otherwise; both
+backends write compact UTF-8 JSON unless pretty output is asked for
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+def dumps(data: Any, pretty: bool = False) -> bytes:
+    """Encode data as UTF-8 JSON, compact or indented by two spaces"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # orjson rejects a few values the stdlib accepts, e.g. integers
+            # wider than 64 bits
+            pass
+    
+    # ASCII escapes keep the stdlib on its fast path; the output is still UTF-8
+    if pretty:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_file(filepath: str) -> Any:
+    """Read and decode a JSON file"""
+    with open(filepath, 'rb') as f:
+        return loads(f.read())
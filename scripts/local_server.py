@@ -10,7 +10,7 @@ import os
 import json
 import threading
 import webbrowser
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 import sys
 
@@ -20,9 +20,21 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from utils import logger, ConfigManager, DataManager
 from auto_post import MoneyMatrixOrchestrator
 
+# Injected into served pages in watch mode; reloads the tab after a rebuild
+LIVE_RELOAD_SCRIPT = b"""<script>
+new EventSource('/api/events').onmessage = function () { location.reload(); };
+</script>
+"""
+
 class MoneyMatrixHandler(SimpleHTTPRequestHandler):
     """Custom handler for local development server"""
     
+    # Set by run_local_server when watch mode is on
+    reload_broadcaster = None
+    
+    # Serializes /api/build with watch-mode rebuilds of the same output
+    build_lock = threading.Lock()
+    
     def __init__(self, *args, **kwargs):
         self.data_manager = DataManager()
         self.config_manager = ConfigManager()
@@ -91,6 +103,9 @@ class MoneyMatrixHandler(SimpleHTTPRequestHandler):
             with open(file_path, 'rb') as f:
                 content = f.read()
             
+            if self.reload_broadcaster and content_type == 'text/html':
+                content = self.inject_live_reload(content)
+            
             self.send_response(200)
             self.send_header('Content-Type', content_type)
             self.send_header('Content-Length', str(len(content)))
@@ -101,6 +116,13 @@ class MoneyMatrixHandler(SimpleHTTPRequestHandler):
             logger.error(f"Error serving file {file_path}: {e}")
             self.send_error(500, "Internal server error")
     
+    def inject_live_reload(self, content):
+        """Add the live reload script before </body>"""
+        marker = content.rfind(b'</body>')
+        if marker == -1:
+            return content + LIVE_RELOAD_SCRIPT
+        return content[:marker] + LIVE_RELOAD_SCRIPT + content[marker:]
+    
     def handle_api_request(self, path, query_string):
         """Handle API requests"""
         query_params = parse_qs(query_string) if query_string else {}
@@ -115,6 +137,8 @@ class MoneyMatrixHandler(SimpleHTTPRequestHandler):
             self.api_list_articles()
         elif path == '/api/config':
             self.api_get_config()
+        elif path == '/api/events':
+            self.api_events()
         else:
             self.send_json_response({'error': 'API endpoint not found'}, 404)
     
@@ -152,8 +176,9 @@ class MoneyMatrixHandler(SimpleHTTPRequestHandler):
         """Build site via API"""
         try:
             def build():
-                orchestrator = MoneyMatrixOrchestrator()
-                orchestrator.build_only_mode()
+                with self.build_lock:
+                    orchestrator = MoneyMatrixOrchestrator()
+                    orchestrator.build_only_mode()
             
             thread = threading.Thread(target=build)
             thread.daemon = True
@@ -169,10 +194,11 @@ class MoneyMatrixHandler(SimpleHTTPRequestHandler):
     def api_list_articles(self):
         """List published articles"""
         try:
-            articles = self.data_manager.get_published_articles()
-            # Return summary info
+            # Metadata only: listing never needs the article bodies
+            articles = self.data_manager.get_recent_articles(20, include_content=False)
+            # Return summary info, oldest first
             article_list = []
-            for article in articles[-20:]:  # Last 20 articles
+            for article in reversed(articles):  # Last 20 articles
                 article_list.append({
                     'title': article.get('title', ''),
                     'slug': article.get('slug', ''),
@@ -184,7 +210,7 @@ class MoneyMatrixHandler(SimpleHTTPRequestHandler):
             
             self.send_json_response({
                 'articles': article_list,
-                'total': len(articles)
+                'total': self.data_manager.count_published_articles()
             })
         except Exception as e:
             self.send_json_response({'error': str(e)}, 500)
@@ -201,6 +227,33 @@ class MoneyMatrixHandler(SimpleHTTPRequestHandler):
         except Exception as e:
             self.send_json_response({'error': str(e)}, 500)
     
+    def api_events(self):
+        """Server-sent events stream announcing watch-mode rebuilds"""
+        broadcaster = self.reload_broadcaster
+        if broadcaster is None:
+            self.send_json_response({'error': 'Watch mode is not enabled'}, 404)
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        
+        version = broadcaster.version
+        try:
+            while True:
+                new_version = broadcaster.wait(version, timeout=15)
+                if new_version == version:
+                    # Keep-alive comment so proxies and browsers hold the stream open
+                    self.wfile.write(b': ping\n\n')
+                else:
+                    version = new_version
+                    data = json.dumps({'pages': broadcaster.changed_pages})
+                    self.wfile.write(f"data: {data}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
     def send_json_response(self, data, status_code=200):
         """Send JSON response"""
         response = json.dumps(data, indent=2)
@@ -432,7 +485,7 @@ class MoneyMatrixHandler(SimpleHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(admin_html.encode())
 
-def run_local_server(port=8000, auto_open=True):
+def run_local_server(port=8000, auto_open=True, watch=False, watch_interval=0.5):
     """Run local development server"""
     
     # Change to MoneyMatrix directory
@@ -457,8 +510,23 @@ def run_local_server(port=8000, auto_open=True):
 <body><h1>MoneyMatrix.me</h1><p>Local development server running!</p>
 <p><a href="/admin">Go to Admin Panel</a></p></body></html>""")
     
+    watcher = None
+    if watch:
+        from html_generation import HTMLGenerator
+        from site_watcher import SiteWatcher, ReloadBroadcaster
+        
+        MoneyMatrixHandler.reload_broadcaster = ReloadBroadcaster()
+        watcher = SiteWatcher(
+            HTMLGenerator(),
+            MoneyMatrixHandler.reload_broadcaster,
+            interval=watch_interval,
+            build_lock=MoneyMatrixHandler.build_lock
+        )
+        watcher.start()
+    
+    # Threaded so live reload streams don't block page requests
     server_address = ('', port)
-    httpd = HTTPServer(server_address, MoneyMatrixHandler)
+    httpd = ThreadingHTTPServer(server_address, MoneyMatrixHandler)
     
     print(f"""
 🚀 MoneyMatrix.me Local Development Server
@@ -467,6 +535,7 @@ def run_local_server(port=8000, auto_open=True):
 🌐 Main Site:    http://localhost:{port}/
 🔧 Admin Panel:  http://localhost:{port}/admin
 📊 API Status:   http://localhost:{port}/api/status
+👀 Watch Mode:   {'on (templates/, data/, static/)' if watch else 'off (use --watch)'}
 
 Server running on port {port}...
 Press Ctrl+C to stop
@@ -481,7 +550,9 @@ Press Ctrl+C to stop
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\n\n👋 Server stopped by user")
-        httpd.shutdown()
+        if watcher:
+            watcher.stop()
+        httpd.server_close()
 
 if __name__ == "__main__":
     import argparse
@@ -489,7 +560,14 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='MoneyMatrix.me Local Development Server')
     parser.add_argument('--port', type=int, default=8000, help='Port to run server on (default: 8000)')
     parser.add_argument('--no-browser', action='store_true', help='Don\'t automatically open browser')
+    parser.add_argument('--watch', action='store_true', help='Rebuild changed pages and live-reload the browser')
+    parser.add_argument('--watch-interval', type=float, default=0.5, help='Seconds between change checks (default: 0.5)')
     
     args = parser.parse_args()
     
-    run_local_server(port=args.port, auto_open=not args.no_browser)
\ No newline at end of file
+    run_local_server(
+        port=args.port,
+        auto_open=not args.no_browser,
+        watch=args.watch,
+        watch_interval=args.watch_interval
+    )
\ No newline at end of file
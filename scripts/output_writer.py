@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Output writer for MoneyMatrix.me site builds
+Writes files atomically and leaves unchanged files (and their mtimes) alone
+"""
+
+import os
+from typing import Dict, Optional
+from utils import logger
+
+class OutputWriter:
+    """Atomic, change-aware file writes into a build output directory"""
+    
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self._created_dirs = set()
+        self.stats = {'written': 0, 'unchanged': 0, 'bytes': 0}
+    
+    def _ensure_dir(self, directory: str):
+        """Create directory once per writer"""
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+    
+    def _is_unchanged(self, filepath: str, data: bytes) -> bool:
+        """Check whether filepath already holds exactly data"""
+        try:
+            if os.path.getsize(filepath) != len(data):
+                return False
+            with open(filepath, 'rb') as f:
+                return f.read() == data
+        except OSError:
+            return False
+    
+    def write(self, rel_path: str, content: str) -> Optional[str]:
+        """Write content to rel_path; return the full path if the file changed.
+        
+        The new content goes to a temp file in the same directory and is renamed
+        over the target, so readers see the old or the new file, never a partial
+        one. Renaming also leaves a hardlinked copy in an earlier build generation
+        untouched.
+        """
+        filepath = os.path.join(self.output_dir, rel_path)
+        data = content.encode('utf-8')
+        
+        if self._is_unchanged(filepath, data):
+            self.stats['unchanged'] += 1
+            return None
+        
+        directory, filename = os.path.split(filepath)
+        self._ensure_dir(directory)
+        
+        temp_path = os.path.join(directory, f".{filename}.tmp-{os.getpid()}")
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        self.stats['written'] += 1
+        self.stats['bytes'] += len(data)
+        return filepath
+    
+    def log_summary(self) -> Dict[str, int]:
+        """Log one line for everything written through this writer"""
+        logger.info(
+            f"Wrote {self.stats['written']} files ({self.stats['bytes']} bytes) to {self.output_dir}, "
+            f"{self.stats['unchanged']} unchanged"
+        )
+        return self.stats
@@ -7,10 +7,37 @@ Handles compression, minification, lazy loading, and caching
 import os
 import re
 import gzip
+import json
+import hashlib
+import posixpath
 from pathlib import Path
 from typing import Dict, List
 from utils import ConfigManager, logger
 
+# File types worth serving precompressed; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = ('.html', '.htm', '.css', '.js', '.json', '.xml', '.txt', '.svg')
+
+# Files smaller than this gain nothing from compression
+MIN_COMPRESS_SIZE = 512
+
+# Assets that get content-hashed file names (name.<hash>.ext)
+FINGERPRINT_EXTENSIONS = ('.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico')
+FINGERPRINT_PATTERN = re.compile(r'\.[0-9a-f]{10}\.[A-Za-z0-9]+$')
+ASSET_MANIFEST_NAME = 'asset-manifest.json'
+# Version 2: fingerprinted files are always copies, never hardlinks to their source
+ASSET_MANIFEST_VERSION = 2
+
+# Source size and mtime each compressed variant was made from
+PRECOMPRESS_STATE_FILE = '.precompress-state.json'
+
+ASSET_URL_PATTERN = re.compile(r'/static/[^"\'()\s?#<>]+')
+CSS_URL_PATTERN = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+def _temp_path(path: str) -> str:
+    """Dotfile temp name next to path, so a leftover is never served or compressed"""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, f".{filename}.tmp-{os.getpid()}")
+
 class PerformanceOptimizer:
     """Performance optimization utilities"""
     
@@ -105,6 +132,278 @@ class PerformanceOptimizer:
         
         return js_content.strip()
     
+    def precompress_directory(self, directory: str = 'dist') -> Dict[str, int]:
+        """Write .gz (and .br when brotli is installed) siblings for compressible files
+        
+        The size and mtime of the source each variant was made from are kept in
+        PRECOMPRESS_STATE_FILE, so repeated builds only recompress files that
+        changed, including sources replaced by a file with an older mtime.
+        Dotfiles (build caches and manifests) are never compressed.
+        """
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        
+        stats = {'files': 0, 'gzip': 0, 'brotli': 0, 'skipped': 0, 'bytes': 0}
+        state_path = os.path.join(directory, PRECOMPRESS_STATE_FILE)
+        try:
+            with open(state_path, 'r') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = {}
+        state = {}
+        
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for filename in files:
+                if filename.startswith('.'):
+                    # Variants of build metadata written before dotfiles were skipped
+                    if filename.endswith(('.gz', '.br')) and filename[:-3].endswith(COMPRESSIBLE_EXTENSIONS):
+                        os.remove(os.path.join(root, filename))
+                    continue
+                if not filename.endswith(COMPRESSIBLE_EXTENSIONS):
+                    continue
+                
+                source_path = os.path.join(root, filename)
+                source_stat = os.stat(source_path)
+                if source_stat.st_size < MIN_COMPRESS_SIZE:
+                    # The source may have shrunk since its variants were written
+                    for suffix in ('.gz', '.br'):
+                        if os.path.exists(source_path + suffix):
+                            os.remove(source_path + suffix)
+                    continue
+                source_key = [source_stat.st_size, source_stat.st_mtime_ns]
+                
+                stats['files'] += 1
+                content = None
+                
+                variants = [('.gz', 'gzip')]
+                if brotli:
+                    variants.append(('.br', 'brotli'))
+                
+                for suffix, name in variants:
+                    variant_path = source_path + suffix
+                    rel_path = os.path.relpath(variant_path, directory).replace(os.sep, '/')
+                    if previous.get(rel_path) == source_key and os.path.exists(variant_path):
+                        state[rel_path] = source_key
+                        stats['skipped'] += 1
+                        continue
+                    
+                    if content is None:
+                        with open(source_path, 'rb') as f:
+                            content = f.read()
+                    
+                    if name == 'gzip':
+                        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+                    else:
+                        compressed = brotli.compress(content, quality=11)
+                    
+                    # Not worth serving a variant that is no smaller than the original
+                    if len(compressed) >= len(content):
+                        if os.path.exists(variant_path):
+                            os.remove(variant_path)
+                        continue
+                    
+                    # Write and rename: the old variant may be hardlinked into an
+                    # earlier build generation that a server is still reading
+                    temp_path = _temp_path(variant_path)
+                    with open(temp_path, 'wb') as f:
+                        f.write(compressed)
+                    os.replace(temp_path, variant_path)
+                    state[rel_path] = source_key
+                    stats[name] += 1
+                    stats['bytes'] += len(compressed)
+        
+        temp_path = _temp_path(state_path)
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+        
+        logger.info(
+            f"Precompressed {stats['files']} files "
+            f"({stats['gzip']} gzip, {stats['brotli']} brotli, {stats['skipped']} up to date)"
+        )
+        return stats
+    
+    def write_etag_manifest(self, directory: str = 'dist', manifest_name: str = '.etag-manifest.json') -> int:
+        """Record a content hash per served file so the server can emit strong ETags
+        
+        Each record also stores the size and mtime the hash was taken at; files whose
+        stat still matches the previous manifest are not re-hashed.
+        """
+        manifest_path = os.path.join(directory, manifest_name)
+        
+        try:
+            with open(manifest_path, 'r') as f:
+                previous = json.load(f).get('files', {})
+        except (OSError, ValueError):
+            previous = {}
+        
+        files = {}
+        for root, dirs, filenames in os.walk(directory):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for filename in filenames:
+                # Compressed variants share their source's hash; dotfiles are build metadata
+                if filename.startswith('.') or filename.endswith(('.gz', '.br')):
+                    continue
+                
+                file_path = os.path.join(root, filename)
+                rel_path = os.path.relpath(file_path, directory).replace(os.sep, '/')
+                file_stat = os.stat(file_path)
+                
+                record = previous.get(rel_path)
+                if not (record and record.get('size') == file_stat.st_size
+                        and record.get('mtime_ns') == file_stat.st_mtime_ns):
+                    record = {
+                        'hash': self._hash_file(file_path),
+                        'size': file_stat.st_size,
+                        'mtime_ns': file_stat.st_mtime_ns
+                    }
+                files[rel_path] = record
+        
+        temp_path = _temp_path(manifest_path)
+        with open(temp_path, 'w') as f:
+            json.dump({'files': files}, f)
+        os.replace(temp_path, manifest_path)
+        
+        logger.info(f"Wrote ETag manifest for {len(files)} files")
+        return len(files)
+    
+    def fingerprint_assets(self, directory: str = 'dist', static_subdir: str = 'static') -> Dict[str, str]:
+        """Give static assets content-hashed names and write the asset manifest
+        
+        Every CSS, JS and image file under directory/static_subdir gets a copy
+        named name.<hash>.ext. It is never a hardlink: an in-place write to the
+        source would silently change a URL served as immutable. url() references in CSS
+        are rewritten first, so a stylesheet's hash changes with the images it
+        uses. The manifest maps original URLs to fingerprinted ones. Fingerprinted
+        copies from the previous build are kept so cached pages still resolve.
+        """
+        import shutil
+        
+        manifest_path = os.path.join(directory, ASSET_MANIFEST_NAME)
+        previous = self.load_asset_manifest(directory)
+        previous_files = previous.get('files', {})
+        # Older builds hardlinked fingerprinted files; replace those with copies once
+        trust_existing = previous.get('version') == ASSET_MANIFEST_VERSION
+        
+        sources = []
+        static_root = os.path.join(directory, static_subdir)
+        for root, dirs, filenames in os.walk(static_root):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for filename in filenames:
+                if (filename.startswith('.') or FINGERPRINT_PATTERN.search(filename)
+                        or not filename.lower().endswith(FINGERPRINT_EXTENSIONS)):
+                    continue
+                sources.append(os.path.join(root, filename))
+        
+        # Stylesheets last: their content depends on the other assets' URLs
+        sources.sort(key=lambda path: (path.lower().endswith('.css'), path))
+        
+        assets = {}
+        files = {}
+        for file_path in sources:
+            url = '/' + os.path.relpath(file_path, directory).replace(os.sep, '/')
+            file_stat = os.stat(file_path)
+            
+            content = None
+            if file_path.lower().endswith('.css'):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    original = f.read()
+                rewritten = self.rewrite_css_urls(original, url, assets)
+                digest = hashlib.sha256(rewritten.encode('utf-8')).hexdigest()[:10]
+                if rewritten != original:
+                    content = rewritten
+            else:
+                record = previous_files.get(url)
+                if record and record.get('size') == file_stat.st_size and record.get('mtime_ns') == file_stat.st_mtime_ns:
+                    digest = record['hash']
+                else:
+                    digest = self._hash_file(file_path)[:10]
+            
+            stem, ext = os.path.splitext(file_path)
+            fingerprinted_path = f"{stem}.{digest}{ext}"
+            if not (trust_existing and os.path.exists(fingerprinted_path)):
+                temp_path = _temp_path(fingerprinted_path)
+                if content is not None:
+                    with open(temp_path, 'w', encoding='utf-8') as f:
+                        f.write(content)
+                else:
+                    shutil.copy2(file_path, temp_path)
+                os.replace(temp_path, fingerprinted_path)
+            
+            assets[url] = '/' + os.path.relpath(fingerprinted_path, directory).replace(os.sep, '/')
+            files[url] = {'hash': digest, 'size': file_stat.st_size, 'mtime_ns': file_stat.st_mtime_ns}
+        
+        # Drop fingerprinted copies referenced by neither this build nor the last one
+        keep = set(assets.values()) | set(previous.get('assets', {}).values())
+        removed = 0
+        for root, dirs, filenames in os.walk(static_root):
+            for filename in filenames:
+                base = filename[:-3] if filename.endswith(('.gz', '.br')) else filename
+                if not FINGERPRINT_PATTERN.search(base):
+                    continue
+                file_path = os.path.join(root, filename)
+                url = '/' + os.path.relpath(os.path.join(root, base), directory).replace(os.sep, '/')
+                if url not in keep:
+                    os.remove(file_path)
+                    removed += 1
+        
+        temp_path = _temp_path(manifest_path)
+        with open(temp_path, 'w') as f:
+            json.dump({'version': ASSET_MANIFEST_VERSION, 'assets': assets, 'files': files}, f)
+        os.replace(temp_path, manifest_path)
+        
+        logger.info(f"Fingerprinted {len(assets)} assets ({removed} old copies removed)")
+        return assets
+    
+    def load_asset_manifest(self, directory: str = 'dist') -> Dict:
+        """Load the asset manifest written by fingerprint_assets"""
+        try:
+            with open(os.path.join(directory, ASSET_MANIFEST_NAME), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def rewrite_css_urls(css_content: str, css_url: str, assets: Dict[str, str]) -> str:
+        """Point url() references in a stylesheet at fingerprinted assets"""
+        def replace(match):
+            quote, ref = match.group(1), match.group(2).strip()
+            if ref.startswith(('data:', 'http:', 'https:', '//', '#')):
+                return match.group(0)
+            
+            path, sep, suffix = ref.partition('?') if '?' in ref else ref.partition('#')
+            if not path.startswith('/'):
+                path = posixpath.normpath(posixpath.join(posixpath.dirname(css_url), path))
+            
+            if path not in assets:
+                return match.group(0)
+            return f"url({quote}{assets[path]}{sep}{suffix}{quote})"
+        
+        return CSS_URL_PATTERN.sub(replace, css_content)
+    
+    @staticmethod
+    def rewrite_asset_urls(html_content: str, assets: Dict[str, str]) -> str:
+        """Point /static/... references in a page at fingerprinted assets"""
+        if not assets:
+            return html_content
+        return ASSET_URL_PATTERN.sub(lambda match: assets.get(match.group(0), match.group(0)), html_content)
+    
+    @staticmethod
+    def asset_references(html_content: str, assets: Dict[str, str]) -> Dict[str, str]:
+        """{/static/... URL in a page: the URL rewrite_asset_urls puts in its place}"""
+        return {url: assets.get(url, url) for url in set(ASSET_URL_PATTERN.findall(html_content))}
+    
+    def _hash_file(self, file_path: str) -> str:
+        """Return a short SHA-256 content hash"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:32]
+    
     def _compress_html(self, html_content: str) -> str:
         """Compress HTML by removing unnecessary whitespace"""
         # Preserve whitespace in <pre> and <code> tags
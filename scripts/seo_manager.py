@@ -8,7 +8,8 @@ import json
 import os
 from datetime import datetime
 from typing import Dict, List, Optional
-from utils import ConfigManager, DataManager, logger
+from utils import ConfigManager, DataManager, ArticleIndex, logger
+from sitemap_writer import SitemapWriter, MAX_URLS_PER_SITEMAP, article_lastmod
 
 class SEOManager:
     """Centralized SEO management system"""
@@ -180,71 +181,47 @@ class SEOManager:
         
         return f'<script type="application/ld+json">\n{json.dumps(breadcrumb_list, indent=2)}\n</script>'
     
-    def generate_sitemap(self, output_path: str = 'dist/sitemap.xml') -> bool:
-        """Generate XML sitemap with all pages"""
+    def generate_sitemap(self, output_path: str = 'dist/sitemap.xml',
+                         article_index: Optional[ArticleIndex] = None) -> bool:
+        """Generate XML sitemap with all pages
+        
+        Pass the build's article index to avoid re-reading published_articles.json.
+        """
         try:
             categories = self.data_manager.get_categories()
-            published_articles = self.data_manager.get_published_articles()
-            
-            urls = []
-            
-            # Homepage
-            urls.append({
-                'loc': self.base_url,
-                'lastmod': datetime.now().strftime('%Y-%m-%d'),
-                'changefreq': 'daily',
-                'priority': '1.0'
-            })
+            if article_index is None:
+                article_index = self.data_manager.get_article_index()
+            published_articles = article_index.articles
             
-            # Category pages
-            for category in categories:
-                urls.append({
-                    'loc': f"{self.base_url}/{category['slug']}",
-                    'lastmod': datetime.now().strftime('%Y-%m-%d'),
-                    'changefreq': 'weekly',
-                    'priority': '0.8'
-                })
+            writer = SitemapWriter(
+                os.path.dirname(output_path) or '.', self.base_url,
+                index_name=os.path.basename(output_path),
+                max_urls=self.config_manager.get('seo.sitemap_max_urls', MAX_URLS_PER_SITEMAP),
+                compress=self.config_manager.get('seo.sitemap_gzip', False)
+            )
+            with writer:
+                # Homepage
+                article_dates = [article_lastmod(article) for article in published_articles]
+                writer.add(self.base_url, max(filter(None, article_dates), default=None), 'daily', '1.0')
                 
-                # Comparison pages
-                if category.get('compare_url'):
-                    urls.append({
-                        'loc': category['compare_url'],
-                        'lastmod': datetime.now().strftime('%Y-%m-%d'),
-                        'changefreq': 'weekly',
-                        'priority': '0.9'
-                    })
-            
-            # Article pages
-            for article in published_articles:
-                article_url = article.get('url', '')
-                if article_url:
-                    urls.append({
-                        'loc': article_url,
-                        'lastmod': article.get('date_modified', article.get('date_published', datetime.now().isoformat()))[:10],
-                        'changefreq': 'monthly',
-                        'priority': '0.7'
-                    })
-            
-            # Generate XML
-            sitemap_xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-            sitemap_xml += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-            
-            for url_data in urls:
-                sitemap_xml += '  <url>\n'
-                sitemap_xml += f'    <loc>{self._escape_xml(url_data["loc"])}</loc>\n'
-                sitemap_xml += f'    <lastmod>{url_data["lastmod"]}</lastmod>\n'
-                sitemap_xml += f'    <changefreq>{url_data["changefreq"]}</changefreq>\n'
-                sitemap_xml += f'    <priority>{url_data["priority"]}</priority>\n'
-                sitemap_xml += '  </url>\n'
-            
-            sitemap_xml += '</urlset>'
-            
-            # Save to file
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(sitemap_xml)
+                # Category pages
+                for category in categories:
+                    category_dates = [
+                        article_lastmod(article) for article in article_index.in_category(category['slug'])
+                    ]
+                    category_lastmod = max(filter(None, category_dates), default=None)
+                    writer.add(f"{self.base_url}/{category['slug']}", category_lastmod, 'weekly', '0.8')
+                    
+                    # Comparison pages
+                    if category.get('compare_url'):
+                        writer.add(category['compare_url'], category_lastmod, 'weekly', '0.9')
+                
+                # Article pages, in publishing order so new ones only touch the last sitemap file
+                for article in published_articles:
+                    article_url = article.get('url', '')
+                    if article_url:
+                        writer.add(article_url, article_lastmod(article), 'monthly', '0.7')
             
-            logger.info(f"Generated sitemap with {len(urls)} URLs")
             return True
             
         except Exception as e:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Watch mode for MoneyMatrix.me local development
+Polls templates/, data/ and static/ for changes, rebuilds only the affected
+pages and notifies open browser tabs so they reload
+"""
+
+import os
+import time
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from utils import logger
+
+class ReloadBroadcaster:
+    """Wakes every waiting browser connection when the site changes"""
+    
+    def __init__(self):
+        self.version = 0
+        self.changed_pages = []
+        self._condition = threading.Condition()
+    
+    def notify(self, changed_pages: List[str]):
+        """Announce a rebuild to all listeners"""
+        with self._condition:
+            self.version += 1
+            self.changed_pages = changed_pages
+            self._condition.notify_all()
+    
+    def wait(self, seen_version: int, timeout: float) -> int:
+        """Block until the version moves past seen_version or timeout; return the version"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != seen_version, timeout)
+            return self.version
+
+class SiteWatcher:
+    """Polling file watcher that drives incremental rebuilds"""
+    
+    def __init__(self, html_generator, broadcaster: Optional[ReloadBroadcaster] = None,
+                 watch_dirs: Tuple[str, ...] = ("templates", "data", "static"),
+                 interval: float = 0.5, build_lock: Optional[threading.Lock] = None):
+        self.html_generator = html_generator
+        self.broadcaster = broadcaster
+        self.watch_dirs = watch_dirs
+        self.interval = interval
+        # Held while rebuilding; share it with anything else that builds the site
+        self.build_lock = build_lock or threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._snapshot = self.snapshot()
+    
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Map every watched file to its (mtime_ns, size)"""
+        files = {}
+        for watch_dir in self.watch_dirs:
+            for root, dirs, filenames in os.walk(watch_dir):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                for filename in filenames:
+                    # Skip editor swap files and our own temp files
+                    if filename.startswith('.') or filename.endswith(('~', '.swp')):
+                        continue
+                    file_path = os.path.join(root, filename)
+                    try:
+                        file_stat = os.stat(file_path)
+                    except OSError:
+                        continue
+                    files[file_path] = (file_stat.st_mtime_ns, file_stat.st_size)
+        return files
+    
+    def poll(self) -> Set[str]:
+        """Return the files added, changed or removed since the last poll"""
+        current = self.snapshot()
+        changed = {
+            path for path in set(current) | set(self._snapshot)
+            if current.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = current
+        return changed
+    
+    def rebuild(self, changed: Set[str]) -> List[str]:
+        """Rebuild what the changed inputs affect and notify listeners.
+        
+        static/ changes only need a static sync. Template and data changes go
+        through the build cache, which re-renders exactly the pages whose
+        template chain or data inputs changed.
+        """
+        touches_static = any(path.split(os.sep, 1)[0] == "static" for path in changed)
+        touches_pages = any(path.split(os.sep, 1)[0] != "static" for path in changed)
+        
+        with self.build_lock:
+            started = time.perf_counter()
+            changed_pages = self.html_generator.rebuild_changed_pages(pages=touches_pages, static=touches_static)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        logger.info(
+            f"Watch: {len(changed)} input(s) changed, rebuilt {len(changed_pages)} page(s) "
+            f"in {elapsed_ms:.0f}ms"
+        )
+        if self.broadcaster and (changed_pages or touches_static):
+            self.broadcaster.notify(changed_pages)
+        return changed_pages
+    
+    def run(self):
+        """Poll until stopped, rebuilding once a burst of changes settles"""
+        while not self._stop.wait(self.interval):
+            changed = self.poll()
+            if not changed:
+                continue
+            
+            # Editors and generators often write several files in a row
+            while not self._stop.wait(self.interval):
+                more = self.poll()
+                if not more:
+                    break
+                changed |= more
+            
+            try:
+                self.rebuild(changed)
+            except Exception as e:
+                logger.error(f"Watch rebuild failed: {e}")
+    
+    def start(self):
+        """Start watching in a background thread"""
+        self._thread = threading.Thread(target=self.run, name="site-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {', '.join(self.watch_dirs)} for changes")
+    
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
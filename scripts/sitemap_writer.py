@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Streaming sitemap writer for MoneyMatrix.me
+Splits URLs across numbered sitemap files under a sitemap index, within the
+sitemap protocol limits, and only rewrites files whose URLs changed
+"""
+
+import os
+import gzip
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional
+from xml.sax.saxutils import escape
+from utils import logger
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+MAX_URLS_PER_SITEMAP = 50000
+MAX_BYTES_PER_SITEMAP = 50 * 1024 * 1024
+SITEMAP_STATE_FILE = '.sitemap-state.json'
+
+URLSET_HEADER = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NAMESPACE}">\n'.encode('utf-8')
+URLSET_FOOTER = b'</urlset>\n'
+
+def article_lastmod(article: Dict) -> Optional[str]:
+    """YYYY-MM-DD an article was last modified or published, if known"""
+    date_value = article.get('date_modified') or article.get('date_published') or ''
+    try:
+        return datetime.fromisoformat(date_value.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+class SitemapWriter:
+    """Streams URL entries into sitemap-N.xml files and writes a sitemap index.
+    
+    Entries are written to a temp file as they are added, so memory use does not
+    grow with the number of URLs. A sitemap file is closed once it reaches
+    max_urls entries or max_bytes uncompressed. When a file's content hash
+    matches the previous build's, the existing file (and its mtime) is kept.
+    """
+    
+    def __init__(self, output_dir: str, base_url: str, index_name: str = 'sitemap.xml',
+                 max_urls: int = MAX_URLS_PER_SITEMAP, max_bytes: int = MAX_BYTES_PER_SITEMAP,
+                 compress: bool = False):
+        self.output_dir = output_dir
+        self.base_url = base_url.rstrip('/')
+        self.index_name = index_name
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.compress = compress
+        
+        self.state_path = os.path.join(output_dir, SITEMAP_STATE_FILE)
+        self.previous = self._load_state()
+        self.state = {}
+        self.sitemaps = []
+        self.stats = {'urls': 0, 'sitemaps': 0, 'written': 0, 'unchanged': 0, 'bytes': 0}
+        
+        self._file = None
+        self._raw_file = None
+        self._temp_path = None
+        self._digest = None
+        self._count = 0
+        self._size = 0
+        self._lastmod = None
+    
+    def __enter__(self) -> 'SitemapWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._abort()
+    
+    def _load_state(self) -> Dict[str, str]:
+        """Content hashes of the sitemap files written by the previous build"""
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f).get('sitemaps', {})
+        except (OSError, ValueError):
+            return {}
+    
+    def _sitemap_name(self, number: int) -> str:
+        stem = os.path.splitext(self.index_name)[0]
+        return f"{stem}-{number}.xml" + (".gz" if self.compress else "")
+    
+    def add(self, loc: str, lastmod: Optional[str] = None, changefreq: Optional[str] = None,
+            priority: Optional[str] = None):
+        """Append one URL, starting a new sitemap file when the current one is full"""
+        parts = ['  <url>', f'    <loc>{escape(loc)}</loc>']
+        if lastmod:
+            parts.append(f'    <lastmod>{lastmod}</lastmod>')
+        if changefreq:
+            parts.append(f'    <changefreq>{changefreq}</changefreq>')
+        if priority:
+            parts.append(f'    <priority>{priority}</priority>')
+        parts.append('  </url>\n')
+        data = '\n'.join(parts).encode('utf-8')
+        
+        if self._file is not None and (
+            self._count >= self.max_urls
+            or self._size + len(data) + len(URLSET_FOOTER) > self.max_bytes
+        ):
+            self._finish_sitemap()
+        if self._file is None:
+            self._start_sitemap()
+        
+        self._write(data)
+        self._count += 1
+        self.stats['urls'] += 1
+        if lastmod and (self._lastmod is None or lastmod > self._lastmod):
+            self._lastmod = lastmod
+    
+    def _start_sitemap(self):
+        filename = self._sitemap_name(len(self.sitemaps) + 1)
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        self._temp_path = os.path.join(self.output_dir, f".{filename}.tmp-{os.getpid()}")
+        self._raw_file = open(self._temp_path, 'wb')
+        # mtime=0 keeps the gzip bytes identical for identical content
+        self._file = gzip.GzipFile(fileobj=self._raw_file, mode='wb', mtime=0) if self.compress else self._raw_file
+        self._digest = hashlib.sha256()
+        self._count = 0
+        self._size = 0
+        self._lastmod = None
+        self._write(URLSET_HEADER)
+    
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._digest.update(data)
+        self._size += len(data)
+    
+    def _finish_sitemap(self):
+        """Close the current sitemap file and keep it only if its content changed"""
+        self._write(URLSET_FOOTER)
+        if self._file is not self._raw_file:
+            self._file.close()
+        self._raw_file.close()
+        
+        filename = self._sitemap_name(len(self.sitemaps) + 1)
+        file_path = os.path.join(self.output_dir, filename)
+        content_hash = self._digest.hexdigest()
+        
+        if self.previous.get(filename) == content_hash and os.path.exists(file_path):
+            os.remove(self._temp_path)
+            self.stats['unchanged'] += 1
+        else:
+            self.stats['bytes'] += os.path.getsize(self._temp_path)
+            os.replace(self._temp_path, file_path)
+            self.stats['written'] += 1
+        
+        self.state[filename] = content_hash
+        self.sitemaps.append((filename, self._lastmod))
+        self._file = self._raw_file = self._temp_path = None
+    
+    def _abort(self):
+        """Drop a partially written sitemap file"""
+        if self._file is not None:
+            if self._file is not self._raw_file:
+                self._file.close()
+            self._raw_file.close()
+            os.remove(self._temp_path)
+            self._file = self._raw_file = self._temp_path = None
+    
+    def _write_index(self):
+        """Write the sitemap index unless it is unchanged"""
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">'
+        ]
+        for filename, lastmod in self.sitemaps:
+            lines.append('  <sitemap>')
+            lines.append(f'    <loc>{escape(self.base_url)}/{filename}</loc>')
+            if lastmod:
+                lines.append(f'    <lastmod>{lastmod}</lastmod>')
+            lines.append('  </sitemap>')
+        lines.append('</sitemapindex>\n')
+        data = '\n'.join(lines).encode('utf-8')
+        
+        index_path = os.path.join(self.output_dir, self.index_name)
+        try:
+            with open(index_path, 'rb') as f:
+                if f.read() == data:
+                    self.stats['unchanged'] += 1
+                    return
+        except OSError:
+            pass
+        
+        temp_path = os.path.join(self.output_dir, f".{self.index_name}.tmp-{os.getpid()}")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, index_path)
+        self.stats['written'] += 1
+        self.stats['bytes'] += len(data)
+    
+    def close(self) -> Dict[str, int]:
+        """Finish the last sitemap, write the index and remove leftover sitemap files"""
+        if self._file is not None:
+            self._finish_sitemap()
+        self._write_index()
+        
+        # A stale plain sitemap-N.xml shares its precompressed name with a live
+        # sitemap-N.xml.gz once compression is switched on, so only names this
+        # build did not write are removed
+        live = set(self.state) | {self.index_name}
+        for filename in self.previous:
+            if filename in self.state:
+                continue
+            for path in (filename, filename + '.gz', filename + '.br'):
+                if path in live:
+                    continue
+                path = os.path.join(self.output_dir, path)
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        temp_path = f"{self.state_path}.tmp-{os.getpid()}"
+        with open(temp_path, 'w') as f:
+            json.dump({'sitemaps': self.state}, f)
+        os.replace(temp_path, self.state_path)
+        
+        self.stats['sitemaps'] = len(self.sitemaps)
+        logger.info(
+            f"Sitemap: {self.stats['urls']} URLs in {self.stats['sitemaps']} file(s), "
+            f"{self.stats['written']} written, {self.stats['unchanged']} unchanged"
+        )
+        return self.stats
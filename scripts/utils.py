@@ -3,11 +3,153 @@ import os
 import re
 import random
 import hashlib
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from urllib.parse import quote, unquote
 import requests
 from pathlib import Path
+import json_codec
+
+try:
+    import fcntl
+except ImportError:  # Windows: inter-process locks become no-ops
+    fcntl = None
+
+class ConcurrentUpdateError(Exception):
+    """A read-modify-write kept losing to concurrent writers"""
+
+@contextmanager
+def file_lock(filepath: str):
+    """Hold an exclusive inter-process lock on filepath (via filepath.lock)"""
+    if fcntl is None:
+        yield
+        return
+    
+    with open(filepath + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def file_version(filepath: str) -> Optional[str]:
+    """Content hash of filepath, or None if it does not exist"""
+    try:
+        with open(filepath, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def atomic_write_json(filepath: str, data: Any, pretty: bool = False):
+    """Write JSON to a temp file, fsync it and rename it over filepath.
+    
+    Readers see the old or the new document, never a partial one. The file is
+    compact unless pretty is set.
+    """
+    directory, filename = os.path.split(filepath)
+    temp_path = os.path.join(directory, f".{filename}.tmp-{os.getpid()}-{threading.get_ident()}")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(json_codec.dumps(data, pretty=pretty))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(
+        f"'{type(self).__name__}' is a shared cached document; "
+        "load it with mutable=True to get a copy that can be modified"
+    )
+
+class ReadOnlyDict(dict):
+    """dict that refuses in-place changes; still a dict for json, orjson and Jinja"""
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+    
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+class ReadOnlyList(list):
+    """list that refuses in-place changes; slicing and + still return plain lists"""
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    
+    def __reduce__(self):
+        return (list, (list(self),))
+    
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+def freeze(data: Any) -> Any:
+    """Read-only copy of a parsed JSON document"""
+    if isinstance(data, dict):
+        return ReadOnlyDict((key, freeze(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return ReadOnlyList(freeze(value) for value in data)
+    return data
+
+def thaw(data: Any) -> Any:
+    """Plain, modifiable copy of a (possibly frozen) JSON document"""
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [thaw(value) for value in data]
+    return data
+
+class JSONDocumentCache:
+    """Process-wide cache of parsed JSON files.
+    
+    Entries are keyed by absolute path and validated against the file's
+    (mtime_ns, size) on every read, so a file is only parsed again after it
+    changes on disk. The returned documents are shared, so they are frozen
+    into ReadOnlyDict/ReadOnlyList: modifying one raises TypeError instead of
+    silently changing what every other caller sees.
+    """
+    
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def load(self, filepath: str) -> Any:
+        """Parsed document at filepath; raises FileNotFoundError if missing"""
+        key = os.path.abspath(filepath)
+        file_stat = os.stat(key)
+        signature = (file_stat.st_mtime_ns, file_stat.st_size)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.stats['hits'] += 1
+                return entry[1]
+        
+        data = freeze(json_codec.load_file(key))
+        
+        with self._lock:
+            self._entries[key] = (signature, data)
+            self.stats['misses'] += 1
+        return data
+    
+    def invalidate(self, filepath: Optional[str] = None):
+        """Forget one file, or every file"""
+        with self._lock:
+            if filepath is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(filepath), None)
+
+json_cache = JSONDocumentCache()
 
 class ConfigManager:
     """Manages configuration and API credentials"""
@@ -20,16 +162,14 @@ class ConfigManager:
     def load_config(self) -> Dict:
         """Load main configuration"""
         try:
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            return json_cache.load(self.config_path)
         except FileNotFoundError:
             return self.create_default_config()
     
     def load_credentials(self) -> Dict:
         """Load API credentials"""
         try:
-            with open('data/api_credentials.json', 'r') as f:
-                return json.load(f)
+            return json_cache.load('data/api_credentials.json')
         except FileNotFoundError:
             print("Warning: API credentials file not found")
             return {}
@@ -67,7 +207,7 @@ class ConfigManager:
         with open(self.config_path, 'w') as f:
             json.dump(default_config, f, indent=2)
         
-        return default_config
+        return freeze(default_config)
     
     def get(self, key: str, default=None):
         """Get configuration value with dot notation"""
@@ -98,28 +238,75 @@ class ConfigManager:
 class DataManager:
     """Manages JSON data files"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", backend: Optional[str] = None):
         self.data_dir = data_dir
+        self.backend = backend
+        self._article_store = None
         self.ensure_data_dir()
     
     def ensure_data_dir(self):
         """Ensure data directory exists"""
         os.makedirs(self.data_dir, exist_ok=True)
     
-    def load_json(self, filename: str) -> Dict:
-        """Load JSON file"""
+    def load_json(self, filename: str, mutable: bool = False) -> Dict:
+        """Load JSON file.
+        
+        Repeated loads of an unchanged file return the same shared, read-only
+        document without touching the disk. Pass mutable=True to get a private
+        copy to modify and save.
+        """
         filepath = os.path.join(self.data_dir, filename)
         try:
-            with open(filepath, 'r') as f:
-                return json.load(f)
+            data = json_cache.load(filepath)
         except FileNotFoundError:
-            return {}
+            return {} if mutable else ReadOnlyDict()
+        return thaw(data) if mutable else data
+    
+    @staticmethod
+    def pretty_json() -> bool:
+        """Whether data files are written indented (storage.pretty_json) instead of compact"""
+        return bool(config_manager.get('storage.pretty_json', False))
     
     def save_json(self, filename: str, data: Dict):
-        """Save JSON file"""
+        """Save JSON file atomically, replacing whatever is there.
+        
+        Use update_json to change a file other processes may also write.
+        """
+        filepath = os.path.join(self.data_dir, filename)
+        with file_lock(filepath):
+            atomic_write_json(filepath, data, pretty=self.pretty_json())
+        json_cache.invalidate(filepath)
+    
+    def update_json(self, filename: str, update: Callable[[Dict], Any], retries: int = 10) -> Any:
+        """Read-modify-write a JSON file without losing concurrent updates.
+        
+        update(data) changes a private copy of the document in place and its
+        return value is passed back. The write only happens if the file still
+        holds the version that was read; otherwise update runs again on the
+        newer document.
+        """
         filepath = os.path.join(self.data_dir, filename)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        
+        for attempt in range(retries):
+            # Parse exactly the bytes the version was taken from
+            try:
+                with open(filepath, 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                raw = None
+            version = hashlib.sha256(raw).hexdigest() if raw is not None else None
+            data = json_codec.loads(raw) if raw else {}
+            
+            result = update(data)
+            
+            with file_lock(filepath):
+                if file_version(filepath) != version:
+                    continue
+                atomic_write_json(filepath, data, pretty=self.pretty_json())
+            json_cache.invalidate(filepath)
+            return result
+        
+        raise ConcurrentUpdateError(f"Gave up updating {filepath} after {retries} conflicting writes")
     
     def get_categories(self) -> List[Dict]:
         """Get all categories"""
@@ -131,29 +318,92 @@ class DataManager:
         data = self.load_json('topics.json')
         return data.get('topics', [])
     
+    @property
+    def article_store(self):
+        """Published article storage selected by storage.backend (json, sqlite or log)"""
+        if self._article_store is None:
+            from article_store import create_article_store
+            
+            self._article_store = create_article_store(
+                self,
+                self.backend or config_manager.get('storage.backend', 'json'),
+                config_manager.get('storage.sqlite_path')
+            )
+        return self._article_store
+    
     def get_published_articles(self) -> List[Dict]:
         """Get published articles"""
-        data = self.load_json('published_articles.json')
-        return data.get('published_articles', [])
+        return self.article_store.published_articles()
     
     def add_published_article(self, article_data: Dict):
         """Add article to published list"""
-        data = self.load_json('published_articles.json')
-        
-        if 'published_articles' not in data:
-            data['published_articles'] = []
-        
         article_data['published_at'] = datetime.now().isoformat()
-        data['published_articles'].append(article_data)
-        data['total_published'] = len(data['published_articles'])
-        data['last_published'] = article_data['published_at']
-        
-        self.save_json('published_articles.json', data)
+        self.article_store.add_published_article(article_data)
+    
+    def get_article(self, slug: str) -> Optional[Dict]:
+        """Get a published article by slug"""
+        return self.article_store.get_article(slug)
+    
+    def get_recent_articles(self, limit: int = 10, category_slug: Optional[str] = None,
+                            include_content: bool = True) -> List[Dict]:
+        """Newest published articles, optionally within one category"""
+        return self.article_store.recent_articles(limit, category_slug, include_content)
+    
+    def update_article(self, slug: str, changes: Dict) -> bool:
+        """Apply changes to a published article; False if the slug is unknown"""
+        return self.article_store.update_article(slug, changes)
+    
+    def count_published_articles(self) -> int:
+        """Number of published articles"""
+        return self.article_store.count_articles()
     
     def get_external_blogs(self) -> List[Dict]:
         """Get external blog configurations"""
         data = self.load_json('external_blogs.json')
         return data.get('external_blogs', [])
+    
+    def get_article_index(self) -> 'ArticleIndex':
+        """Load published articles once into an in-memory index"""
+        return ArticleIndex(self.get_published_articles())
+
+class ArticleIndex:
+    """Read-only view of the published articles for the duration of a build.
+    
+    Articles are grouped by category and presorted newest first, with O(1)
+    lookups by slug and by category.
+    """
+    
+    def __init__(self, articles: List[Dict]):
+        self.articles = articles
+        self.newest_first = sorted(
+            articles,
+            key=lambda x: x.get('date_published', ''),
+            reverse=True
+        )
+        
+        self.by_slug = {}
+        self.by_category = {}
+        for article in self.newest_first:
+            self.by_slug.setdefault(article.get('slug', ''), article)
+            self.by_category.setdefault(article.get('category_slug', ''), []).append(article)
+    
+    def __len__(self) -> int:
+        return len(self.articles)
+    
+    def __iter__(self):
+        return iter(self.articles)
+    
+    def get(self, slug: str) -> Optional[Dict]:
+        """Get article by slug"""
+        return self.by_slug.get(slug)
+    
+    def recent(self, limit: int = 6) -> List[Dict]:
+        """Newest articles across all categories"""
+        return self.newest_first[:limit]
+    
+    def in_category(self, category_slug: str) -> List[Dict]:
+        """Articles in a category, newest first"""
+        return self.by_category.get(category_slug, [])
 
 class ContentUtils:
     """Utilities for content processing"""
@@ -311,8 +561,7 @@ class ScheduleManager:
     
     def get_next_publish_time(self, interval_hours: int = 2) -> datetime:
         """Get next scheduled publish time"""
-        published_data = self.data_manager.load_json('published_articles.json')
-        last_published = published_data.get('last_published')
+        last_published = self.data_manager.article_store.last_published()
         
         if last_published:
             last_time = datetime.fromisoformat(last_published.replace('Z', '+00:00'))
@@ -329,18 +578,15 @@ class ScheduleManager:
     
     def get_publishing_queue(self) -> List[Dict]:
         """Get articles in publishing queue"""
-        published_data = self.data_manager.load_json('published_articles.json')
-        return published_data.get('publishing_schedule', {}).get('queue', [])
+        return self.data_manager.article_store.publishing_queue()
     
     def add_to_queue(self, article_data: Dict):
         """Add article to publishing queue"""
-        published_data = self.data_manager.load_json('published_articles.json')
-        
-        if 'publishing_schedule' not in published_data:
-            published_data['publishing_schedule'] = {'queue': []}
-        
-        published_data['publishing_schedule']['queue'].append(article_data)
-        self.data_manager.save_json('published_articles.json', published_data)
+        self.data_manager.article_store.add_to_queue(article_data)
+    
+    def remove_from_queue(self, article_data: Dict) -> bool:
+        """Remove an article from the publishing queue"""
+        return self.data_manager.article_store.remove_from_queue(article_data)
 
 class LinkingUtils:
     """Utilities for internal linking"""
@@ -0,0 +1,39 @@
+"""
+Regression tests shared by the article store backends
+Run from the project root: python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from article_store import EventLogArticleStore, JSONArticleStore, SQLiteArticleStore
+from utils import DataManager
+
+@pytest.fixture(params=['json', 'sqlite', 'log'])
+def store(request, tmp_path):
+    if request.param == 'json':
+        yield JSONArticleStore(DataManager(str(tmp_path)))
+    elif request.param == 'sqlite':
+        store = SQLiteArticleStore(str(tmp_path / 'articles.db'))
+        yield store
+        store.close()
+    else:
+        store = EventLogArticleStore(str(tmp_path))
+        yield store
+        store.log.close()
+
+def test_get_and_update_pick_the_same_duplicate_slug(store):
+    # Republished later, but with an older date_published than the first copy
+    store.add_published_article({'slug': 'rates', 'title': 'first', 'date_published': '2026-03-01',
+                                 'published_at': '2026-03-01T00:00:00'})
+    store.add_published_article({'slug': 'rates', 'title': 'second', 'date_published': '2026-01-01',
+                                 'published_at': '2026-03-02T00:00:00'})
+
+    assert store.get_article('rates')['title'] == 'second'
+    assert store.update_article('rates', {'title': 'second (edited)'})
+    assert store.get_article('rates')['title'] == 'second (edited)'
+    assert [article['title'] for article in store.published_articles()] == ['first', 'second (edited)']
@@ -0,0 +1,60 @@
+"""
+Regression tests for the publish event log shared by several processes
+Run from the project root: python -m pytest tests
+"""
+
+import os
+import sys
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from article_store import EventLogArticleStore
+
+def _compact_then_modify(data_dir, slug, title):
+    """Second process: compact the shared log, then edit an article"""
+    store = EventLogArticleStore(data_dir)
+    store.log.compact()
+    assert store.update_article(slug, {'title': title})
+    store.log.close()
+
+def _run_in_other_process(target, *args):
+    process = multiprocessing.get_context('spawn').Process(target=target, args=args)
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+
+def test_edit_after_other_process_compacts_survives(tmp_path):
+    data_dir = str(tmp_path)
+    store = EventLogArticleStore(data_dir)
+    store.add_published_article({'slug': 'rates', 'title': 'old', 'published_at': '2026-01-01T00:00:00'})
+    store.log.flush()
+
+    _run_in_other_process(_compact_then_modify, data_dir, 'rates', 'new')
+
+    # Catching up replays from the other process's snapshot
+    assert store.get_article('rates')['title'] == 'new'
+    assert store.published_articles()[0]['title'] == 'new'
+
+    # Compacting here must not write back the pre-edit state
+    store.log.compact()
+    store.log.close()
+
+    fresh = EventLogArticleStore(data_dir)
+    assert fresh.get_article('rates')['title'] == 'new'
+    fresh.log.close()
+
+def test_appends_from_two_processes_are_all_kept(tmp_path):
+    data_dir = str(tmp_path)
+    store = EventLogArticleStore(data_dir)
+    store.add_published_article({'slug': 'first', 'title': 'First', 'published_at': '2026-01-01T00:00:00'})
+    store.log.flush()
+
+    _run_in_other_process(_compact_then_modify, data_dir, 'first', 'First (edited)')
+    store.add_published_article({'slug': 'second', 'title': 'Second', 'published_at': '2026-01-02T00:00:00'})
+    store.log.close()
+
+    fresh = EventLogArticleStore(data_dir)
+    assert [article['slug'] for article in fresh.published_articles()] == ['first', 'second']
+    assert fresh.get_article('first')['title'] == 'First (edited)'
+    fresh.log.close()
@@ -0,0 +1,47 @@
+"""
+Regression tests for the shared parsed-JSON cache behind DataManager.load_json
+Run from the project root: python -m pytest tests
+"""
+
+import os
+import sys
+import json
+import pickle
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from utils import DataManager
+
+def _data_manager(tmp_path):
+    with open(tmp_path / 'categories.json', 'w') as f:
+        json.dump({'categories': [{'slug': 'auto-loans', 'tags': ['cars']}]}, f)
+    return DataManager(str(tmp_path))
+
+def test_shared_documents_cannot_be_modified_in_place(tmp_path):
+    data_manager = _data_manager(tmp_path)
+    categories = data_manager.get_categories()
+
+    with pytest.raises(TypeError):
+        categories.append({'slug': 'extra'})
+    with pytest.raises(TypeError):
+        categories[0]['slug'] = 'changed'
+    with pytest.raises(TypeError):
+        categories[0]['tags'].sort()
+
+    assert data_manager.get_categories() == [{'slug': 'auto-loans', 'tags': ['cars']}]
+
+def test_mutable_loads_are_private_copies(tmp_path):
+    data_manager = _data_manager(tmp_path)
+    data = data_manager.load_json('categories.json', mutable=True)
+    data['categories'][0]['tags'].append('trucks')
+
+    assert data_manager.get_categories()[0]['tags'] == ['cars']
+
+def test_shared_documents_still_serialize_as_plain_json(tmp_path):
+    categories = _data_manager(tmp_path).get_categories()
+
+    assert json.loads(json.dumps(categories)) == categories
+    assert type(pickle.loads(pickle.dumps(categories))[0]) is dict
+    assert categories + [{'slug': 'extra'}] == [categories[0], {'slug': 'extra'}]
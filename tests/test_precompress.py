@@ -0,0 +1,26 @@
+"""
+Regression tests for precompressed .gz/.br variants of the build output
+Run from the project root: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from performance_optimizer import MIN_COMPRESS_SIZE, PerformanceOptimizer
+
+def test_variants_are_removed_when_the_source_shrinks(tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text('<p>compressible</p>\n' * 200)
+    optimizer = PerformanceOptimizer()
+
+    optimizer.precompress_directory(str(tmp_path))
+    assert (tmp_path / 'page.html.gz').exists()
+
+    page.write_text('<p>short</p>')
+    assert page.stat().st_size < MIN_COMPRESS_SIZE
+    optimizer.precompress_directory(str(tmp_path))
+
+    assert not (tmp_path / 'page.html.gz').exists()
+    assert not (tmp_path / 'page.html.br').exists()
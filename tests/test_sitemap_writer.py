@@ -0,0 +1,57 @@
+"""
+Regression tests for the chunked sitemap writer
+Run from the project root: python -m pytest tests
+"""
+
+import os
+import sys
+import gzip
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from sitemap_writer import SitemapWriter
+
+def _write_sitemap(output_dir, compress):
+    with SitemapWriter(output_dir, 'https://example.com', compress=compress) as writer:
+        for number in range(3):
+            writer.add(f'https://example.com/page-{number}/', lastmod='2026-01-01')
+    return writer
+
+def _served_files(output_dir):
+    return sorted(name for name in os.listdir(output_dir) if not name.startswith('.'))
+
+def _index_targets(output_dir):
+    with open(os.path.join(output_dir, 'sitemap.xml'), 'r') as f:
+        index = f.read()
+    return [filename for filename in _served_files(output_dir) if f'https://example.com/{filename}<' in index]
+
+def test_turning_gzip_on_then_off_keeps_the_indexed_sitemap(tmp_path):
+    output_dir = str(tmp_path)
+
+    _write_sitemap(output_dir, compress=False)
+    assert _served_files(output_dir) == ['sitemap-1.xml', 'sitemap.xml']
+
+    _write_sitemap(output_dir, compress=True)
+    assert _served_files(output_dir) == ['sitemap-1.xml.gz', 'sitemap.xml']
+    assert _index_targets(output_dir) == ['sitemap-1.xml.gz']
+    with gzip.open(os.path.join(output_dir, 'sitemap-1.xml.gz'), 'rb') as f:
+        assert b'https://example.com/page-2/' in f.read()
+
+    _write_sitemap(output_dir, compress=False)
+    assert _served_files(output_dir) == ['sitemap-1.xml', 'sitemap.xml']
+    assert _index_targets(output_dir) == ['sitemap-1.xml']
+
+def test_precompressed_variants_of_dropped_sitemaps_are_removed(tmp_path):
+    output_dir = str(tmp_path)
+
+    with SitemapWriter(output_dir, 'https://example.com', max_urls=1) as writer:
+        writer.add('https://example.com/a/')
+        writer.add('https://example.com/b/')
+    # What precompress_directory leaves next to a plain sitemap
+    for filename in ('sitemap-2.xml.gz', 'sitemap-2.xml.br'):
+        with open(os.path.join(output_dir, filename), 'wb') as f:
+            f.write(b'variant')
+
+    with SitemapWriter(output_dir, 'https://example.com', max_urls=1) as writer:
+        writer.add('https://example.com/a/')
+    assert _served_files(output_dir) == ['sitemap-1.xml', 'sitemap.xml']